@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ApiPortfolioConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'api_portfolio'
+
+    def ready(self):
+        from api_portfolio import signals  # noqa: F401
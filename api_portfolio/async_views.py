@@ -0,0 +1,163 @@
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+from api_portfolio.models import Portfolio, Stock, StockPrice
+from api_portfolio.pagination import (
+    KeysetOrPageNumberPagination,
+    PriceKeysetOrPageNumberPagination,
+)
+from api_portfolio.serializers import (
+    PortfolioSummarySerializer,
+    SimpleStockSerializer,
+    StockPriceSerializer,
+)
+from api_portfolio.services.portfolio_service import PortfolioService
+from api_portfolio.services.portfolio_valuation import PortfolioValuation
+from api_portfolio.services.price_export import PriceExportService
+from api_portfolio.services.price_resolver import PriceResolver
+from api_portfolio.services.summary_cache import get_summary_cache
+from api_portfolio.utils.mixins import ConditionalGetMixin, DateValidationMixin, ReplicaReadMixin
+from api_portfolio.utils.renderers import CSVRenderer, NDJSONRenderer
+from api_portfolio.views import PortfolioPricesMixin
+
+
+class AsyncAPIView(View):
+    """
+    Plain Django async view returning the same JSON as the DRF views.
+    DRF views are synchronous, so these use the async ORM directly and
+    hand the parts that only exist synchronously (pagination) to a thread.
+    """
+    pagination_class = None
+    serializer_class = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            response = await super().dispatch(request, *args, **kwargs)
+        except ValidationError as exc:
+            response = self.respond(exc.detail, status.HTTP_400_BAD_REQUEST)
+        return self.finalize_response(request, response, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Same hook as DRF's, so ConditionalGetMixin works on both.
+        return response
+
+    @staticmethod
+    def respond(data, status_code=status.HTTP_200_OK):
+        return JsonResponse(data, encoder=JSONEncoder, status=status_code, safe=False)
+
+    def not_found(self, model):
+        return self.respond(
+            {'detail': f"No {model._meta.object_name} matches the given query."},
+            status.HTTP_404_NOT_FOUND
+        )
+
+    async def paginate(self, request, queryset):
+        paginator = self.pagination_class()
+        page = await sync_to_async(paginator.paginate_queryset)(queryset, Request(request), self)
+        data = self.serializer_class(page, many=True).data
+        return self.respond(paginator.get_paginated_response(data).data)
+
+
+class AsyncStockListView(AsyncAPIView):
+    pagination_class = KeysetOrPageNumberPagination
+    serializer_class = SimpleStockSerializer
+
+    async def get(self, request):
+        return await self.paginate(request, Stock.objects.order_by('id'))
+
+
+class AsyncStockPricesView(ReplicaReadMixin, ConditionalGetMixin, DateValidationMixin, AsyncAPIView):
+    pagination_class = PriceKeysetOrPageNumberPagination
+    serializer_class = StockPriceSerializer
+    export_renderers = [NDJSONRenderer, CSVRenderer]
+
+    def get_export_renderer(self, request):
+        requested = request.GET.get('format')
+        accept = request.headers.get('Accept', '')
+        for renderer in self.export_renderers:
+            if requested == renderer.format or (not requested and renderer.media_type in accept):
+                return renderer
+        return None
+
+    def get_response_format(self):
+        renderer = self.get_export_renderer(self.request)
+        return renderer.format if renderer else 'json'
+
+    async def get(self, request, symbol):
+        try:
+            stock = await Stock.objects.select_related('latest_price').aget(symbol=symbol.upper())
+        except Stock.DoesNotExist:
+            return self.not_found(Stock)
+        latest = getattr(stock, 'latest_price', None)
+        not_modified = self.check_not_modified(
+            self.get_etag(stock.pk, latest and latest.date, latest and latest.updated_at),
+            latest and latest.updated_at
+        )
+        if not_modified:
+            return not_modified
+
+        start_date = self.validate_dates(request.GET.get('start_date'))
+        end_date = self.validate_dates(request.GET.get('end_date'))
+
+        prices = StockPrice.objects.filter(stock=stock).order_by('-date')
+        if start_date:
+            prices = prices.filter(date__gte=start_date)
+        if end_date:
+            prices = prices.filter(date__lte=end_date)
+
+        renderer = self.get_export_renderer(request)
+        if renderer is not None:
+            # Streamed after the view returns; bind the read database now.
+            export = PriceExportService(prices.using(prices.db))
+            response = StreamingHttpResponse(
+                getattr(export, f'a{renderer.format}')(),
+                content_type=f'{renderer.media_type}; charset={renderer.charset}'
+            )
+            response['Content-Disposition'] = (
+                f'attachment; filename="{stock.symbol}_prices.{renderer.format}"'
+            )
+            return response
+
+        return await self.paginate(request, prices)
+
+
+class AsyncPortfolioSummaryView(ReplicaReadMixin, ConditionalGetMixin, PortfolioPricesMixin, AsyncAPIView):
+    def get_response_format(self):
+        return 'json'
+
+    async def get(self, request, name):
+        start_date = self.validate_dates(request.GET.get('start_date'))
+        end_date = self.validate_dates(request.GET.get('end_date'))
+        try:
+            portfolio = await PortfolioService.with_validators(
+                self.get_portfolio_queryset()
+            ).aget(name=name)
+        except Portfolio.DoesNotExist:
+            return self.not_found(Portfolio)
+        not_modified = self.check_not_modified(
+            self.get_etag(portfolio.pk, portfolio.updated_at, portfolio.prices_updated_at),
+            max(filter(None, [portfolio.updated_at, portfolio.prices_updated_at]))
+        )
+        if not_modified:
+            return not_modified
+
+        summary_cache = get_summary_cache()
+        data = await sync_to_async(summary_cache.get)(portfolio, start_date, end_date)
+        if data is not None:
+            return self.respond(data)
+
+        dates = [start_date, end_date] if start_date and end_date else []
+        prices = PriceResolver.for_holdings(portfolio.holdings.all(), dates)
+        await prices.aresolve()
+
+        valuation = PortfolioValuation(portfolio, start_date, end_date, prices)
+        serializer = PortfolioSummarySerializer(
+            portfolio,
+            context={'request': request, 'valuations': {portfolio.pk: valuation}}
+        )
+        await sync_to_async(summary_cache.set)(portfolio, start_date, end_date, serializer.data)
+        return self.respond(serializer.data)
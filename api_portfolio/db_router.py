@@ -0,0 +1,70 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_read_database = ContextVar('read_database', default=None)
+
+
+def replica_alias():
+    return getattr(settings, 'REPLICA_DATABASE', None)
+
+
+@contextmanager
+def read_database(alias):
+    token = _read_database.set(alias)
+    try:
+        yield
+    finally:
+        _read_database.reset(token)
+
+
+@contextmanager
+def replica_reads():
+    """
+    Sends the reads of the block to the replica, unless the reads of the
+    current request are already pinned (to the primary, after a write).
+    """
+    alias = replica_alias()
+    if alias is None or _read_database.get() is not None:
+        yield
+    else:
+        with read_database(alias):
+            yield
+
+
+def primary_reads():
+    return read_database(DEFAULT_DB_ALIAS)
+
+
+def reading_from_replica():
+    alias = _read_database.get()
+    return alias is not None and alias == replica_alias()
+
+
+def replica_lag():
+    """Seconds the data being read may be behind the primary."""
+    return settings.REPLICA_MAX_LAG if reading_from_replica() else 0
+
+
+class ReplicaRouter:
+    """
+    Writes always go to the primary. Reads go to the primary too, except
+    inside ``replica_reads`` blocks, which read-mostly views and the
+    analytics services open around their queries.
+    """
+    def db_for_read(self, model, **hints):
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema through replication.
+        if db == replica_alias():
+            return False
+        return None
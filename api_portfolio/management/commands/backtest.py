@@ -0,0 +1,89 @@
+import os
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from api_portfolio.models import Portfolio
+from api_portfolio.services.backtest_service import BacktestService
+from api_portfolio.utils.constants import (
+    BACKTEST_CHUNK_SIZE,
+    BACKTEST_DEFAULT_DAYS,
+    BACKTEST_DEFAULT_WINDOW_DAYS,
+)
+
+class Command(BaseCommand):
+    help = (
+        'Computes profit and annualized return of portfolios over every rolling '
+        'window in a date range across worker processes, writing the results to CSV'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=parse_date, help='Start date (YYYY-MM-DD, default: five years before --end)')
+        parser.add_argument('--end', type=parse_date, help='End date (YYYY-MM-DD, default: today)')
+        parser.add_argument(
+            '--window-days',
+            type=int,
+            default=BACKTEST_DEFAULT_WINDOW_DAYS,
+            help='Length of the rolling windows'
+        )
+        parser.add_argument(
+            '--step-days',
+            type=int,
+            default=1,
+            help='Days between the ends of consecutive windows'
+        )
+        parser.add_argument(
+            '--portfolio',
+            action='append',
+            help='Portfolio name to backtest (repeatable, defaults to all)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='Number of worker processes'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=BACKTEST_CHUNK_SIZE,
+            help='Portfolios per task sent to a worker'
+        )
+        parser.add_argument('--output', default='backtest.csv', help='CSV file to write the results to')
+
+    def handle(self, *args, **options):
+        end = options['end'] or timezone.now().date()
+        start = options['start'] or end - timedelta(days=BACKTEST_DEFAULT_DAYS)
+        if options['workers'] < 1 or options['chunk_size'] < 1:
+            raise CommandError("--workers and --chunk-size must be at least 1")
+
+        portfolios = Portfolio.objects.all()
+        if options['portfolio']:
+            portfolios = portfolios.filter(name__in=options['portfolio'])
+            missing = set(options['portfolio']) - set(portfolios.values_list('name', flat=True))
+            if missing:
+                raise CommandError(f"Unknown portfolios: {', '.join(sorted(missing))}")
+
+        try:
+            backtest = BacktestService(
+                portfolios,
+                start,
+                end,
+                window_days=options['window_days'],
+                step_days=options['step_days'],
+                workers=options['workers'],
+                chunk_size=options['chunk_size'],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        def progress(done, total):
+            self.stdout.write(f"Backtested {done}/{total} portfolios")
+
+        with open(options['output'], 'w', newline='') as output:
+            result = backtest.run(output, progress)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {result['rows']} rows ({result['portfolios']} portfolios x "
+            f"{result['windows']} windows of {options['window_days']} days) to {options['output']}"
+        ))
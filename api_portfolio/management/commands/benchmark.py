@@ -0,0 +1,353 @@
+import asyncio
+import json
+import math
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, reset_queries
+from django.test import AsyncClient, Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+from django.utils import timezone
+from api_portfolio.models import Portfolio, Stock
+from api_portfolio.services.portfolio_snapshot_service import PortfolioSnapshotService
+from api_portfolio.services.price_cache import get_price_cache
+from api_portfolio.services.profit_calculator import ProfitCalculator
+from api_portfolio.utils.constants import (
+    ADD_STOCKS_BULK_MODE,
+    BENCHMARK_PREFIX,
+    EXPAND_VALUATION,
+)
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the hot API paths on a seeded throwaway database and '
+        'compares query counts with a stored baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stocks', type=int, default=200, help='Stocks to seed')
+        parser.add_argument('--days', type=int, default=365, help='Days of price history to seed')
+        parser.add_argument('--portfolios', type=int, default=20, help='Portfolios to seed')
+        parser.add_argument(
+            '--holdings-per-portfolio',
+            type=int,
+            default=25,
+            help='Holdings of each seeded portfolio'
+        )
+        parser.add_argument(
+            '--payload-size',
+            type=int,
+            default=500,
+            help='Stocks per add_stocks request'
+        )
+        parser.add_argument('--iterations', type=int, default=20, help='Timed runs per case')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed of the dataset')
+        parser.add_argument(
+            '--case',
+            action='append',
+            help='Only run the named case (repeatable)'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Requests per throughput run (0 skips the WSGI/ASGI comparison)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Threads (WSGI) or concurrent tasks (ASGI) of a throughput run'
+        )
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument(
+            '--baseline',
+            help='Fail when a case runs more queries than in this JSON file'
+        )
+
+    def handle(self, *args, **options):
+        # Everything that decides the query counts; a baseline is only
+        # comparable with runs on the same dataset.
+        dataset = {
+            key: options[key]
+            for key in (
+                'stocks', 'days', 'portfolios', 'holdings_per_portfolio',
+                'payload_size', 'seed',
+            )
+        }
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.seed(dataset)
+            # Repeating a summary would otherwise time cache hits, not the
+            # valuation; load_test measures the cache.
+            with override_settings(SUMMARY_CACHE={'CACHE_ALIAS': None}):
+                results = self.run_cases(options)
+                throughput = self.run_throughput(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'dataset': dataset,
+            'iterations': options['iterations'],
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'results': results,
+            'throughput': throughput,
+        }
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name}: p50={result['p50_ms']}ms p95={result['p95_ms']}ms "
+                f"p99={result['p99_ms']}ms queries={result['queries']} "
+                f"peak={result['peak_memory_kb']}KiB"
+            )
+        for name, result in throughput.items():
+            self.stdout.write(
+                f"{name}: wsgi={result['wsgi_rps']} req/s asgi={result['asgi_rps']} req/s "
+                f"(concurrency {options['concurrency']})"
+            )
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, indent=2) + '\n')
+            self.stdout.write(f"Wrote {options['output']}")
+
+        if options['baseline']:
+            self.compare(report, options['baseline'])
+
+    def seed(self, dataset):
+        call_command(
+            'generate_fake_stocks',
+            '--scale',
+            f"--stocks={dataset['stocks']}",
+            f"--days={dataset['days']}",
+            f"--seed={dataset['seed']}",
+            f"--portfolios={dataset['portfolios']}",
+            f"--holdings-per-portfolio={dataset['holdings_per_portfolio']}",
+            f"--prefix={BENCHMARK_PREFIX}",
+            verbosity=0,
+            stdout=self.stdout,
+        )
+        PortfolioSnapshotService.refresh()
+
+    def cases(self, options):
+        client = Client()
+        portfolio = Portfolio.objects.order_by('id').first()
+        # Writes go to another portfolio so they leave the snapshots read by
+        # the other cases fresh.
+        target = Portfolio.objects.order_by('id').last()
+        stock = Stock.objects.order_by('id').first()
+        end = timezone.now().date()
+        start = end - timedelta(days=options['days'] // 2)
+        summary_url = reverse('portfolio-summary', args=[portfolio.name])
+        prices_url = reverse('stock-prices', args=[stock.symbol])
+        list_url = reverse('list-portfolio')
+        add_url = reverse('add-stocks-to-portfolio', args=[target.name])
+        deep_page = max(1, options['days'] // 20)
+        symbols = Stock.objects.order_by('id').values_list('symbol', flat=True)
+        payload = {
+            'stocks': [
+                {'symbol': symbol, 'quantity': '1.00'}
+                for symbol in symbols[:options['payload_size']]
+            ]
+        }
+
+        def deep_cursor_url():
+            url = f'{prices_url}?page_size=20'
+            for _ in range(deep_page - 1):
+                url = client.get(url).json()['next'] or url
+            return url
+
+        cursor_url = deep_cursor_url()
+        portfolio = Portfolio.objects.prefetch_related('holdings').get(pk=portfolio.pk)
+
+        return {
+            'portfolio_summary': lambda: client.get(summary_url),
+            'portfolio_summary_range': lambda: client.get(
+                summary_url, {'start_date': start.isoformat(), 'end_date': end.isoformat()}
+            ),
+            'portfolio_list': lambda: client.get(list_url),
+            'portfolio_list_valuation': lambda: client.get(
+                list_url, {'expand': EXPAND_VALUATION}
+            ),
+            'stock_prices_deep_page': lambda: client.get(
+                prices_url, {'page': deep_page, 'page_size': 20}
+            ),
+            'stock_prices_deep_cursor': lambda: client.get(cursor_url),
+            'add_stocks': lambda: client.post(
+                add_url,
+                payload,
+                content_type='application/json'
+            ),
+            'add_stocks_bulk': lambda: client.post(
+                f'{add_url}?mode={ADD_STOCKS_BULK_MODE}',
+                payload,
+                content_type='application/json'
+            ),
+            'annualized_return': lambda: ProfitCalculator.annualized_return(
+                portfolio, start, end
+            ),
+        }
+
+    def run_cases(self, options):
+        results = {}
+        for name, case in self.cases(options).items():
+            if options['case'] and name not in options['case']:
+                continue
+            get_price_cache().clear()
+            results[name] = self.measure(case, options['iterations'])
+        return results
+
+    def throughput_urls(self, options):
+        portfolio = Portfolio.objects.order_by('id').first()
+        stock = Stock.objects.order_by('id').first()
+        end = timezone.now().date()
+        start = end - timedelta(days=options['days'] // 2)
+        date_range = f'?start_date={start.isoformat()}&end_date={end.isoformat()}'
+        return {
+            'portfolio_summary': (
+                reverse('portfolio-summary', args=[portfolio.name]),
+                reverse('async-portfolio-summary', args=[portfolio.name]),
+            ),
+            'portfolio_summary_range': (
+                reverse('portfolio-summary', args=[portfolio.name]) + date_range,
+                reverse('async-portfolio-summary', args=[portfolio.name]) + date_range,
+            ),
+            'stock_list': (reverse('stock-list'), reverse('async-stock-list')),
+            'stock_prices': (
+                reverse('stock-prices', args=[stock.symbol]),
+                reverse('async-stock-prices', args=[stock.symbol]),
+            ),
+        }
+
+    @staticmethod
+    def split(total, workers):
+        return [total // workers + (index < total % workers) for index in range(workers)]
+
+    @staticmethod
+    def check_response(url, response):
+        if response.status_code != 200:
+            raise CommandError(f"{url} answered {response.status_code}")
+
+    def wsgi_throughput(self, url, total, concurrency):
+        def worker(count):
+            client = Client()
+            try:
+                for _ in range(count):
+                    self.check_response(url, client.get(url))
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            list(executor.map(worker, self.split(total, concurrency)))
+        return total / (time.perf_counter() - started)
+
+    def asgi_throughput(self, url, total, concurrency):
+        client = AsyncClient()
+
+        async def worker(count):
+            for _ in range(count):
+                self.check_response(url, await client.get(url))
+
+        async def run():
+            await asyncio.gather(*(worker(count) for count in self.split(total, concurrency)))
+
+        started = time.perf_counter()
+        asyncio.run(run())
+        return total / (time.perf_counter() - started)
+
+    def run_throughput(self, options):
+        """
+        Requests per second of the sync DRF views served from threads, as
+        under a threaded WSGI server, against their async counterparts
+        awaited concurrently on one event loop, as under ASGI.
+        """
+        results = {}
+        if options['requests'] <= 0:
+            return results
+        for name, (sync_url, async_url) in self.throughput_urls(options).items():
+            if options['case'] and name not in options['case']:
+                continue
+            get_price_cache().clear()
+            results[name] = {
+                'wsgi_rps': round(
+                    self.wsgi_throughput(sync_url, options['requests'], options['concurrency']), 1
+                ),
+                'asgi_rps': round(
+                    self.asgi_throughput(async_url, options['requests'], options['concurrency']), 1
+                ),
+            }
+        return results
+
+    @staticmethod
+    def percentile(timings, fraction):
+        ordered = sorted(timings)
+        return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+    def measure(self, case, iterations):
+        case()
+
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            case()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        # The query log is a bounded deque; empty it so the capture counts.
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            case()
+
+        tracemalloc.start()
+        try:
+            case()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'p50_ms': round(self.percentile(timings, 0.50), 3),
+            'p95_ms': round(self.percentile(timings, 0.95), 3),
+            'p99_ms': round(self.percentile(timings, 0.99), 3),
+            'mean_ms': round(sum(timings) / len(timings), 3),
+            'queries': len(queries),
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+
+    def compare(self, report, baseline_path):
+        """
+        Fails on a case running more queries than in the baseline. Latency
+        and throughput vary too much between runs and machines to gate on,
+        so they are only reported.
+        """
+        baseline = json.loads(Path(baseline_path).read_text())
+        if baseline['dataset'] != report['dataset']:
+            raise CommandError(
+                f"Baseline dataset {baseline['dataset']} does not match {report['dataset']}"
+            )
+
+        regressions = []
+        for name, expected in baseline['results'].items():
+            result = report['results'].get(name)
+            if result is None:
+                continue
+            if result['queries'] > expected['queries']:
+                regressions.append(
+                    f"{name}: {result['queries']} queries (baseline {expected['queries']})"
+                )
+
+        if regressions:
+            raise CommandError("Performance regressions:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
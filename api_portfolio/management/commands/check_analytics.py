@@ -0,0 +1,65 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from api_portfolio.models import Portfolio
+from api_portfolio.services.portfolio_analytics import PortfolioAnalytics
+from api_portfolio.utils.constants import ANALYTICS_RELATIVE_TOLERANCE
+
+class Command(BaseCommand):
+    help = 'Checks the vectorized analytics engine against the Decimal profit calculator'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=parse_date, required=True, help='Start date (YYYY-MM-DD)')
+        parser.add_argument('--end', type=parse_date, required=True, help='End date (YYYY-MM-DD)')
+        parser.add_argument(
+            '--window-days',
+            type=int,
+            default=30,
+            help='Length of the rolling windows to compare'
+        )
+        parser.add_argument(
+            '--step-days',
+            type=int,
+            default=7,
+            help='Days between the starts of consecutive windows'
+        )
+        parser.add_argument(
+            '--portfolio',
+            action='append',
+            help='Portfolio name to check (repeatable, defaults to all)'
+        )
+
+    def handle(self, *args, **options):
+        start, end = options['start'], options['end']
+        if not start or not end or end < start:
+            raise CommandError("Provide --start and --end as YYYY-MM-DD with start <= end")
+
+        ranges = [(start, end)]
+        window = timedelta(days=options['window_days'])
+        window_start = start
+        while window_start + window <= end:
+            ranges.append((window_start, window_start + window))
+            window_start += timedelta(days=options['step_days'])
+
+        portfolios = Portfolio.objects.all()
+        if options['portfolio']:
+            portfolios = portfolios.filter(name__in=options['portfolio'])
+
+        failures = []
+        for portfolio in portfolios:
+            errors = PortfolioAnalytics(portfolio, start, end).compare_with_decimal(ranges)
+            worst = max(errors.values())
+            self.stdout.write(
+                f"{portfolio.name}: {len(ranges)} ranges, "
+                f"max relative error profit={errors['profit']:.3e} "
+                f"annualized_return={errors['annualized_return']:.3e}"
+            )
+            if worst > ANALYTICS_RELATIVE_TOLERANCE:
+                failures.append(portfolio.name)
+
+        if failures:
+            raise CommandError(
+                f"Analytics differ from the Decimal path beyond "
+                f"{ANALYTICS_RELATIVE_TOLERANCE} for: {', '.join(failures)}"
+            )
+        self.stdout.write(self.style.SUCCESS("Analytics match the Decimal path"))
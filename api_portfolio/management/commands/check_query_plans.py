@@ -0,0 +1,99 @@
+import re
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from api_portfolio.models import (
+    Holding,
+    LatestStockPrice,
+    Portfolio,
+    PortfolioDailyValue,
+    Stock,
+    StockPrice,
+)
+from api_portfolio.services.portfolio_service import PortfolioService
+from api_portfolio.services.price_resolver import PriceResolver
+
+# Plan fragments that mean a hot query reads a whole table or sorts rows
+# outside an index.
+SQLITE_FULL_SCAN = re.compile(r'\bSCAN (?!.*\bUSING (COVERING |INTEGER PRIMARY )?(KEY|INDEX)\b)')
+SQLITE_TEMP_SORT = re.compile(r'USE TEMP B-TREE')
+POSTGRESQL_FULL_SCAN = re.compile(r'Seq Scan')
+POSTGRESQL_SORT = re.compile(r'(?<!Incremental )Sort\b')
+
+class Command(BaseCommand):
+    help = 'Fails when a hot query plan falls back to a full table scan or a temporary sort'
+
+    def hot_queries(self):
+        today = timezone.now().date()
+        stock_id = 1
+        portfolio_id = 1
+
+        return {
+            'portfolio by name': Portfolio.objects.filter(name='portfolio'),
+            'stock by symbol': Stock.objects.filter(symbol='STK'),
+            'current price': LatestStockPrice.objects.filter(stock_id=stock_id),
+            'price on or before date': (
+                StockPrice.objects.filter(stock_id=stock_id, date__lte=today)
+                .order_by('-date').values('price')[:1]
+            ),
+            'batched prices': PriceResolver([stock_id], [today]).get_queryset([stock_id]),
+            'holdings with stocks': (
+                Holding.objects.filter(portfolio_id__in=[portfolio_id]).select_related('stock')
+            ),
+            'price history page': (
+                StockPrice.objects.filter(stock_id=stock_id, date__lt=today)
+                .order_by('-date')[:21]
+            ),
+            'price history range': (
+                StockPrice.objects.filter(stock_id__in=[stock_id], date__gt=today, date__lte=today)
+                .values_list('stock_id', 'date', 'price')
+            ),
+            'portfolio list page': (
+                PortfolioService.with_list_fields(Portfolio.objects.filter(pk__gt=portfolio_id))
+                .order_by('id')[:21]
+            ),
+            'portfolio snapshot': (
+                PortfolioDailyValue.objects.filter(portfolio_id=portfolio_id, date=today)
+                .values('value_units')
+            ),
+        }
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            # Tiny tables make sequential scans cheapest; forbid them so the
+            # plan shows whether a usable index exists.
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+                    cursor.execute('SET LOCAL enable_sort = off')
+                return queryset.explain()
+        return queryset.explain()
+
+    def problems(self, plan):
+        if connection.vendor == 'postgresql':
+            checks = {'full scan': POSTGRESQL_FULL_SCAN, 'sort': POSTGRESQL_SORT}
+        else:
+            checks = {'full scan': SQLITE_FULL_SCAN, 'temp b-tree sort': SQLITE_TEMP_SORT}
+        return [
+            name for name, pattern in checks.items()
+            if any(pattern.search(line) for line in plan.splitlines())
+        ]
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f"Query plan checks are not supported on {connection.vendor}")
+
+        failures = []
+        for name, queryset in self.hot_queries().items():
+            plan = self.explain(queryset)
+            problems = self.problems(plan)
+            if options['verbosity'] > 1 or problems:
+                self.stdout.write(f"{name}:\n{plan}\n")
+            if problems:
+                failures.append(f"{name} ({', '.join(problems)})")
+            else:
+                self.stdout.write(f"{name}: ok")
+
+        if failures:
+            raise CommandError(f"Hot queries with bad plans: {'; '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All hot query plans use indexes"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from api_portfolio.services.price_store import get_price_store
+
+class Command(BaseCommand):
+    help = (
+        'Exports StockPrice to the columnar price store read by the analytics, '
+        'appending new dates and rewriting stocks whose history changed'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Rewrite every stock instead of only the stale ones'
+        )
+
+    def handle(self, *args, **options):
+        store = get_price_store()
+        if not store.enabled:
+            raise CommandError("Set PRICE_STORE['PATH'] to export the price store")
+
+        stats = store.export(rebuild=options['rebuild'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {stats['rows']} prices to {store.path}: {stats['written']} stocks "
+            f"written, {stats['appended']} appended, {stats['unchanged']} unchanged, "
+            f"{stats['removed']} removed"
+        ))
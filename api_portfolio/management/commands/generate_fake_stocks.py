@@ -1,8 +1,17 @@
+import io
 import random
 import time
-from django.core.management.base import BaseCommand
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
 from django.utils import timezone
-from api_portfolio.models import Stock, StockPrice
+from api_portfolio.models import Holding, Portfolio, Stock, StockPrice
+from api_portfolio.signals import notify_prices_written
+from api_portfolio.utils.constants import (
+    BULK_BATCH_SIZE,
+    FAKE_PRICES_CHUNK_SIZE,
+    MAX_LENGTH_SYMBOL,
+)
 from datetime import timedelta
 
 class Command(BaseCommand):
@@ -32,9 +41,46 @@ class Command(BaseCommand):
             action='store_true',
             help='Update existing stocks instead of creating new ones'
         )
+        parser.add_argument(
+            '--scale',
+            action='store_true',
+            help='High-volume mode: sequential symbols, NumPy random walks and chunked inserts'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Random seed for reproducible datasets'
+        )
+        parser.add_argument(
+            '--portfolios',
+            type=int,
+            default=0,
+            help='Number of portfolios to create in scale mode'
+        )
+        parser.add_argument(
+            '--holdings-per-portfolio',
+            type=int,
+            default=10,
+            help='Number of holdings of each generated portfolio'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=FAKE_PRICES_CHUNK_SIZE,
+            help='Price rows written per transaction in scale mode'
+        )
 
     def handle(self, *args, **options):
-        if options['update']:
+        if options['seed'] is not None:
+            random.seed(options['seed'])
+
+        if options['scale'] and options['update']:
+            raise CommandError("--scale always creates new stocks; it cannot be combined with --update")
+
+        if options['scale']:
+            self.generate_scale(options)
+        elif options['update']:
             self.update_stock_prices(options['days'], options['prefix'])
         else:
             self.generate_stocks(options['stocks'], options['days'], options['prefix'])
@@ -94,6 +140,7 @@ class Command(BaseCommand):
                 latest_price = StockPrice.objects.filter(
                     stock=stock
                 ).latest('date').price
+                latest_price = float(latest_price)
             except StockPrice.DoesNotExist:
                 latest_price = random.uniform(10, 200)
             
@@ -117,9 +164,166 @@ class Command(BaseCommand):
                     price=round(price, 2),
                 ))
         
+        stock_dates = {}
+        for record in price_records:
+            stock_dates[record.stock_id] = min(
+                record.date, stock_dates.get(record.stock_id, record.date)
+            )
+
         try:
             batch_size = 1000
-            for i in range(0, len(price_records), batch_size):
-                StockPrice.objects.bulk_create(price_records[i:i + batch_size])
+            with transaction.atomic():
+                for i in range(0, len(price_records), batch_size):
+                    StockPrice.objects.bulk_create(price_records[i:i + batch_size])
+                notify_prices_written(stock_dates)
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"Error creating prices: {e}"))
+
+
+    def generate_scale(self, options):
+        num_stocks = options['stocks']
+        num_days = options['days']
+        prefix = options['prefix']
+        chunk_size = options['chunk_size']
+        rng = np.random.default_rng(options['seed'])
+        started = time.perf_counter()
+
+        stock_ids = self.create_scale_stocks(num_stocks, prefix)
+        dates = [
+            timezone.now().date() - timedelta(days=days_ago)
+            for days_ago in range(num_days, -1, -1)
+        ]
+
+        start_prices = rng.uniform(10, 200, size=len(stock_ids))
+        volatilities = rng.uniform(0.005, 0.03, size=len(stock_ids))
+        stocks_per_chunk = max(1, chunk_size // len(dates))
+        rows = 0
+
+        for first in range(0, len(stock_ids), stocks_per_chunk):
+            chunk_ids = stock_ids[first:first + stocks_per_chunk]
+            chunk = slice(first, first + len(chunk_ids))
+            shocks = rng.normal(0, volatilities[chunk, None], size=(len(chunk_ids), len(dates)))
+            shocks[:, 0] = 0
+            prices = start_prices[chunk, None] * np.cumprod(1 + shocks, axis=1)
+            prices = np.maximum(np.round(prices, 2), 0.01)
+
+            with transaction.atomic():
+                self.insert_price_chunk(chunk_ids, dates, prices)
+                notify_prices_written({stock_id: dates[0] for stock_id in chunk_ids})
+            rows += prices.size
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"Inserted {rows} prices for {len(stock_ids)} stocks in {elapsed:.1f}s "
+            f"({rows / elapsed if elapsed else rows:.0f} rows/s)"
+        )
+
+        if options['portfolios']:
+            self.create_scale_portfolios(
+                stock_ids,
+                options['portfolios'],
+                options['holdings_per_portfolio'],
+                prefix,
+                dates[0],
+                rng
+            )
+
+    def create_scale_stocks(self, num_stocks, prefix):
+        width = MAX_LENGTH_SYMBOL - len(prefix)
+        if width <= 0 or num_stocks > 10 ** width:
+            raise CommandError(f"Prefix {prefix!r} leaves no room for {num_stocks} symbols")
+
+        existing = set(
+            Stock.objects.filter(symbol__startswith=prefix).values_list('symbol', flat=True)
+        )
+        symbols = []
+        index = 0
+        while len(symbols) < num_stocks:
+            if index >= 10 ** width:
+                raise CommandError(f"Ran out of free symbols for prefix {prefix!r}")
+            symbol = f"{prefix}{index:0{width}d}"
+            if symbol not in existing:
+                symbols.append(symbol)
+            index += 1
+
+        Stock.objects.bulk_create(
+            [
+                Stock(
+                    symbol=symbol,
+                    name=f"Fake Stock {symbol}",
+                    description=f"Test stock {symbol} for portfolio simulation"
+                )
+                for symbol in symbols
+            ],
+            batch_size=BULK_BATCH_SIZE
+        )
+        stocks = Stock.objects.in_bulk(symbols, field_name='symbol')
+        return [stocks[symbol].pk for symbol in symbols]
+
+    def insert_price_chunk(self, stock_ids, dates, prices):
+        if connection.vendor == 'postgresql':
+            buffer = io.StringIO()
+            for stock_id, stock_prices in zip(stock_ids, prices):
+                for date, price in zip(dates, stock_prices):
+                    buffer.write(f"{stock_id},{date.isoformat()},{price:.2f}\n")
+            buffer.seek(0)
+            with connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {StockPrice._meta.db_table} (stock_id, date, price) "
+                    f"FROM STDIN WITH (FORMAT csv)",
+                    buffer
+                )
+            return
+
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {StockPrice._meta.db_table} (stock_id, date, price) "
+                f"VALUES (%s, %s, %s)",
+                [
+                    (stock_id, date.isoformat(), f"{price:.2f}")
+                    for stock_id, stock_prices in zip(stock_ids, prices)
+                    for date, price in zip(dates, stock_prices)
+                ]
+            )
+
+    def create_scale_portfolios(self, stock_ids, num_portfolios, holdings_per_portfolio,
+                                prefix, purchase_date, rng):
+        holdings_per_portfolio = min(holdings_per_portfolio, len(stock_ids))
+        # Numbered after the highest existing name, so gaps left by deleted
+        # portfolios are never reused.
+        name_prefix = f"{prefix}-PF-"
+        numbers = [
+            int(suffix) for suffix in (
+                name[len(name_prefix):]
+                for name in Portfolio.objects.filter(name__startswith=name_prefix)
+                .values_list('name', flat=True)
+            )
+            if suffix.isdigit()
+        ]
+        first = max(numbers, default=-1) + 1
+        names = [f"{name_prefix}{first + index}" for index in range(num_portfolios)]
+
+        with transaction.atomic():
+            Portfolio.objects.bulk_create(
+                [Portfolio(name=name) for name in names],
+                batch_size=BULK_BATCH_SIZE
+            )
+            portfolios = Portfolio.objects.in_bulk(names, field_name='name')
+            holdings = []
+            for name in names:
+                chosen = rng.choice(len(stock_ids), size=holdings_per_portfolio, replace=False)
+                quantities = np.round(rng.uniform(1, 1000, size=holdings_per_portfolio), 2)
+                holdings.extend(
+                    Holding(
+                        portfolio=portfolios[name],
+                        stock_id=stock_ids[index],
+                        quantity=f"{quantity:.2f}",
+                        purchase_date=purchase_date
+                    )
+                    for index, quantity in zip(chosen, quantities)
+                )
+            Holding.objects.bulk_create(holdings, batch_size=BULK_BATCH_SIZE)
+
+        self.stdout.write(
+            f"Created {num_portfolios} portfolios with {holdings_per_portfolio} holdings each"
+        )
@@ -0,0 +1,162 @@
+import json
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db.models import Max
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from api_portfolio.models import LatestStockPrice, Portfolio
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class PooledWSGIServer(WSGIServer):
+    """
+    Serves requests on a fixed pool of threads, as threaded production
+    servers do, so a thread's database connection can outlive a request
+    when CONN_MAX_AGE allows it. runserver starts a thread per request,
+    which would hide that.
+    """
+    pool = None
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-tests portfolio summaries over HTTP against the configured database, '
+        'to compare database profiles (DB_PROFILE) under read-heavy traffic'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Timed requests')
+        parser.add_argument('--warmup', type=int, default=50, help='Untimed requests sent first')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent clients')
+        parser.add_argument('--threads', type=int, default=8, help='Server worker threads')
+        parser.add_argument(
+            '--portfolios',
+            type=int,
+            default=50,
+            help='Portfolios whose summaries are requested'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='Length of the summary date range, ending at the latest price'
+        )
+        parser.add_argument(
+            '--no-summary-cache',
+            action='store_true',
+            help='Compute every summary instead of serving repeats from the summary cache'
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Random seed of the request mix')
+        parser.add_argument('--output', help='Write the results as JSON to this path')
+
+    def summary_urls(self, options):
+        names = list(Portfolio.objects.order_by('id').values_list('name', flat=True)[:options['portfolios']])
+        if not names:
+            raise CommandError("No portfolios to request; seed some with generate_fake_stocks")
+        end = LatestStockPrice.objects.aggregate(end=Max('date'))['end'] or timezone.now().date()
+        query = urlencode({
+            'start_date': (end - timedelta(days=options['days'])).isoformat(),
+            'end_date': end.isoformat(),
+        })
+        return [f"{reverse('portfolio-summary', args=[name])}?{query}" for name in names]
+
+    @staticmethod
+    def fetch(url):
+        started = time.perf_counter()
+        try:
+            with urlopen(url) as response:
+                response.read()
+        except HTTPError as exc:
+            return exc.code, time.perf_counter() - started
+        return response.status, time.perf_counter() - started
+
+    @staticmethod
+    def percentile(timings, fraction):
+        ordered = sorted(timings)
+        return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+    def run(self, base_url, urls, options):
+        rng = random.Random(options['seed'])
+        requests = [base_url + rng.choice(urls) for _ in range(options['warmup'] + options['requests'])]
+        with ThreadPoolExecutor(options['concurrency']) as clients:
+            list(clients.map(self.fetch, requests[:options['warmup']]))
+            started = time.perf_counter()
+            results = list(clients.map(self.fetch, requests[options['warmup']:]))
+            elapsed = time.perf_counter() - started
+
+        timings = [duration * 1000 for _, duration in results]
+        return {
+            'requests_per_second': round(len(results) / elapsed, 1),
+            'p50_ms': round(self.percentile(timings, 0.50), 3),
+            'p95_ms': round(self.percentile(timings, 0.95), 3),
+            'errors': sum(1 for status, _ in results if status != 200),
+        }
+
+    def handle(self, *args, **options):
+        if min(options['requests'], options['concurrency'], options['threads']) < 1:
+            raise CommandError("--requests, --concurrency and --threads must be at least 1")
+
+        database = settings.DATABASES['default']
+        summary_cache = {'CACHE_ALIAS': None} if options['no_summary_cache'] else settings.SUMMARY_CACHE
+        with override_settings(ALLOWED_HOSTS=['*'], SUMMARY_CACHE=summary_cache):
+            urls = self.summary_urls(options)
+            server = make_server(
+                '127.0.0.1', 0, get_wsgi_application(), PooledWSGIServer, QuietRequestHandler
+            )
+            server.pool = ThreadPoolExecutor(options['threads'])
+            with server.pool:
+                with ThreadPoolExecutor(1) as serving:
+                    serving.submit(server.serve_forever)
+                    try:
+                        results = self.run(f'http://127.0.0.1:{server.server_port}', urls, options)
+                    finally:
+                        server.shutdown()
+                        server.server_close()
+
+        report = {
+            'database': {
+                'engine': database['ENGINE'].rsplit('.', 1)[-1],
+                'conn_max_age': database.get('CONN_MAX_AGE', 0),
+                'init_command': database.get('OPTIONS', {}).get('init_command', ''),
+            },
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'threads': options['threads'],
+            'summary_cache': not options['no_summary_cache'],
+            **results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['requests_per_second']} req/s, p50={report['p50_ms']}ms "
+            f"p95={report['p95_ms']}ms, {report['errors']} errors "
+            f"({report['database']['engine']}, CONN_MAX_AGE={report['database']['conn_max_age']})"
+        ))
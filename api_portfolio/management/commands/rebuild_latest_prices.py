@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from api_portfolio.services.latest_price_service import LatestPriceService
+
+class Command(BaseCommand):
+    help = 'Rebuilds the latest price of every stock from its price history'
+
+    def handle(self, *args, **options):
+        refreshed = LatestPriceService.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt latest prices for {refreshed} stocks")
+        )
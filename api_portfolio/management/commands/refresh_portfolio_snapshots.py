@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from api_portfolio.models import Portfolio
+from api_portfolio.services.portfolio_snapshot_service import PortfolioSnapshotService
+
+class Command(BaseCommand):
+    help = (
+        'Fills the daily portfolio value snapshots up to today, only computing '
+        'new dates and portfolios whose holdings changed'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--portfolio',
+            action='append',
+            help='Name of a portfolio to refresh (repeatable, default: all)'
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recompute every snapshot instead of only the missing ones'
+        )
+
+    def handle(self, *args, **options):
+        portfolios = None
+        if options['portfolio']:
+            portfolios = Portfolio.objects.filter(name__in=options['portfolio'])
+            missing = set(options['portfolio']) - set(portfolios.values_list('name', flat=True))
+            if missing:
+                raise CommandError(f"Unknown portfolios: {', '.join(sorted(missing))}")
+
+        refreshed, written = PortfolioSnapshotService.refresh(portfolios, rebuild=options['rebuild'])
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {written} snapshots for {refreshed} portfolios")
+        )
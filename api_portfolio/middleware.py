@@ -0,0 +1,95 @@
+import json
+import logging
+import random
+from contextlib import ExitStack, nullcontext
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+from api_portfolio.db_router import primary_reads, replica_alias
+from api_portfolio.utils.constants import (
+    PROFILING_DEFAULT_SAMPLE_RATE,
+    PROFILING_LOGGER,
+    PROFILING_SQL_PREVIEW_LENGTH,
+    REPLICA_STICKY_COOKIE,
+)
+from api_portfolio.utils.profiling import RequestProfile, profiling
+
+logger = logging.getLogger(PROFILING_LOGGER)
+
+
+class RequestProfilingMiddleware:
+    """
+    Records query count, DB time, duplicate queries and profiled sections
+    (serialization, valuation) for a sample of requests, and reports them
+    in a ``Server-Timing`` header and one JSON log line per request.
+
+    Configured with the REQUEST_PROFILING setting; when it is disabled the
+    middleware removes itself at startup.
+    """
+    def __init__(self, get_response):
+        options = getattr(settings, 'REQUEST_PROFILING', {})
+        if not options.get('ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = options.get('SAMPLE_RATE', PROFILING_DEFAULT_SAMPLE_RATE)
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        with profiling(RequestProfile()) as profile, ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile.execute_wrapper))
+            response = self.get_response(request)
+        profile.finish()
+
+        response['Server-Timing'] = profile.server_timing()
+        self.log(request, response, profile)
+        return response
+
+    def log(self, request, response, profile):
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(profile.total_time * 1000, 2),
+            'db_ms': round(profile.db_time * 1000, 2),
+            'queries': profile.query_count,
+            'duplicate_queries': profile.duplicate_count,
+            'sections_ms': {
+                name: round(duration * 1000, 2) for name, duration in profile.sections.items()
+            },
+            'duplicates': [
+                {'sql': sql[:PROFILING_SQL_PREVIEW_LENGTH], 'count': count}
+                for sql, count in profile.duplicates()
+            ],
+        }
+        logger.info(json.dumps(record))
+
+
+class ReadYourWritesMiddleware:
+    """
+    After a successful write (any unsafe method), reads of the same client
+    go to the primary for REPLICA_MAX_LAG seconds, so it sees its own
+    writes however far the replica is behind. Clients are recognised by a
+    cookie that expires with that window.
+
+    Removes itself at startup when no replica is configured.
+    """
+    def __init__(self, get_response):
+        if replica_alias() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.max_lag = settings.REPLICA_MAX_LAG
+
+    def __call__(self, request):
+        sticky = REPLICA_STICKY_COOKIE in request.COOKIES
+        with primary_reads() if sticky else nullcontext():
+            response = self.get_response(request)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                REPLICA_STICKY_COOKIE, '1', max_age=self.max_lag, httponly=True, samesite='Lax'
+            )
+        return response
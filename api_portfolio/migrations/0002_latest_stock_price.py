@@ -0,0 +1,51 @@
+# Generated by Django 5.2 on 2026-10-18 12:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_latest_prices(apps, schema_editor):
+    Stock = apps.get_model('api_portfolio', 'Stock')
+    StockPrice = apps.get_model('api_portfolio', 'StockPrice')
+    LatestStockPrice = apps.get_model('api_portfolio', 'LatestStockPrice')
+
+    def latest(field):
+        return Subquery(
+            StockPrice.objects.filter(stock=OuterRef('pk'))
+            .order_by('-date')
+            .values(field)[:1]
+        )
+
+    rows = (
+        Stock.objects.annotate(last_date=latest('date'), last_price=latest('price'))
+        .filter(last_date__isnull=False)
+        .values_list('pk', 'last_date', 'last_price')
+    )
+    LatestStockPrice.objects.bulk_create(
+        [
+            LatestStockPrice(stock_id=stock_id, date=date, price=price)
+            for stock_id, date, price in rows.iterator()
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_portfolio', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatestStockPrice',
+            fields=[
+                ('stock', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='latest_price', serialize=False, to='api_portfolio.stock')),
+                ('date', models.DateField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(populate_latest_prices, migrations.RunPython.noop),
+    ]
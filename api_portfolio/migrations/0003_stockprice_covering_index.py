@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-18 13:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_portfolio', '0002_latest_stock_price'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stockprice',
+            index=models.Index(fields=['stock', '-date', 'price'], name='stockprice_stock_date_price'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 13:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_portfolio', '0003_stockprice_covering_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioDailyValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('value', models.DecimalField(decimal_places=4, max_digits=20)),
+                ('complete', models.BooleanField(default=False)),
+                ('computed_at', models.DateTimeField()),
+                ('portfolio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_values', to='api_portfolio.portfolio')),
+            ],
+            options={
+                'unique_together': {('portfolio', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+def delete_snapshots(apps, schema_editor):
+    # Decimal values may already have been rounded by SQLite; the next
+    # refresh_portfolio_snapshots run recomputes them exactly.
+    apps.get_model('api_portfolio', 'PortfolioDailyValue').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_portfolio', '0004_portfolio_daily_value'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_snapshots, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='portfoliodailyvalue',
+            name='value',
+        ),
+        migrations.AddField(
+            model_name='portfoliodailyvalue',
+            name='value_units',
+            field=models.BigIntegerField(default=0),
+            preserve_default=False,
+        ),
+    ]
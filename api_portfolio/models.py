@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, router, transaction
+from api_portfolio.utils.fixed_point import to_value
 
 class Stock(models.Model):
     symbol = models.CharField(max_length=10, unique=True)
@@ -32,4 +33,50 @@ class StockPrice(models.Model):
     
     class Meta:
         unique_together = [['stock', 'date']]
-        ordering = ['-date']
\ No newline at end of file
+        ordering = ['-date']
+        indexes = [
+            models.Index(
+                fields=['stock', '-date', 'price'],
+                name='stockprice_stock_date_price'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # The post_save receiver refreshes LatestStockPrice; run it in the
+        # same transaction as the write.
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
+class LatestStockPrice(models.Model):
+    stock = models.OneToOneField(
+        Stock,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="latest_price"
+    )
+    date = models.DateField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.stock_id} - {self.date}: {self.price}"
+
+class PortfolioDailyValue(models.Model):
+    portfolio = models.ForeignKey(Portfolio, on_delete=models.CASCADE, related_name="daily_values")
+    date = models.DateField()
+    # Exact fixed-point units (utils.fixed_point): SQLite stores decimals
+    # as floating point and would round large values.
+    value_units = models.BigIntegerField()
+    complete = models.BooleanField(default=False)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = [['portfolio', 'date']]
+
+    def __str__(self):
+        return f"{self.portfolio_id} - {self.date}: {self.value}"
+
+    @property
+    def value(self):
+        return to_value(self.value_units)
@@ -0,0 +1,60 @@
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class KeysetPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = 'id'
+
+
+class PriceKeysetPagination(KeysetPagination):
+    # Price lists are filtered to one stock, so the date alone is the
+    # (stock, date) key and the walk follows the (stock_id, date) index.
+    ordering = '-date'
+
+
+class KeysetOrPageNumberPagination(BasePagination):
+    """
+    Opaque-cursor keyset pagination without a COUNT query. Requests that
+    pass ``?page=`` keep the numbered pages with ``count``.
+    """
+    keyset_class = KeysetPagination
+    page_number_class = StandardResultsSetPagination
+
+    def __init__(self):
+        self.paginator = self.keyset_class()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.page_number_class.page_query_param in request.query_params:
+            self.paginator = self.page_number_class()
+        return self.paginator.paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *self.keyset_class().get_schema_operation_parameters(view),
+            *self.page_number_class().get_schema_operation_parameters(view),
+        ]
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
+
+
+class PriceKeysetOrPageNumberPagination(KeysetOrPageNumberPagination):
+    keyset_class = PriceKeysetPagination
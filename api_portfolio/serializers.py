@@ -1,24 +1,28 @@
+from datetime import date, timedelta
+from django.utils import timezone
 from rest_framework import serializers
 from api_portfolio.models import Stock, Portfolio, Holding, StockPrice
-from api_portfolio.services.stock_service import StockService
-from api_portfolio.services.portfolio_service import PortfolioService
-from api_portfolio.services.profit_calculator import ProfitCalculator
+from api_portfolio.services.portfolio_valuation import PortfolioValuation
 from api_portfolio.utils.constants import (
     MAX_LENGTH_SYMBOL,
     MAX_LENGTH_QUANTITY,
     MAX_LENGTH_QUANTITY_DECIMAL_PLACES,
-    ZERO_PROFIT
+    PORTFOLIO_BATCH_MAX_SIZE,
+    TIMESERIES_DEFAULT_DAYS,
+    TIMESERIES_INTERVALS,
+    TIMESERIES_MAX_DAYS,
 )
 from api_portfolio.utils.mixins import DateValidationMixin
+from api_portfolio.utils.profiling import ProfiledSerializerMixin
 
 
-class SimpleStockSerializer(serializers.ModelSerializer):
+class SimpleStockSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Stock
         fields = ['id', 'symbol', 'name']
         read_only_fields = ['id']
 
-class StockPriceSerializer(serializers.ModelSerializer):
+class StockPriceSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = StockPrice
         fields = ['date', 'price']
@@ -31,7 +35,20 @@ class HoldingSerializer(serializers.ModelSerializer):
         fields = ['id', 'stock', 'quantity', 'purchase_date']
         read_only_fields = ['id']
 
-class PortfolioStockSerializer(serializers.Serializer):
+class PortfolioValuationMixin(DateValidationMixin):
+    def get_valuation(self, portfolio):
+        valuations = self.context.setdefault('valuations', {})
+        if portfolio.pk not in valuations:
+            request = self.context.get('request')
+            valuations[portfolio.pk] = PortfolioValuation(
+                portfolio,
+                self.validate_dates(request.query_params.get('start_date')),
+                self.validate_dates(request.query_params.get('end_date')),
+                self.context.get('prices')
+            )
+        return valuations[portfolio.pk]
+
+class PortfolioStockSerializer(ProfiledSerializerMixin, PortfolioValuationMixin, serializers.Serializer):
     symbol = serializers.CharField(source='stock.symbol')
     name = serializers.CharField(source='stock.name')
     quantity = serializers.DecimalField(
@@ -42,24 +59,12 @@ class PortfolioStockSerializer(serializers.Serializer):
     profit = serializers.SerializerMethodField()
 
     def get_current_price(self, obj):
-        return StockService.get_current_price(obj.stock)
+        return self.get_valuation(obj.portfolio).get_current_price(obj)
 
     def get_profit(self, obj):
-        request = self.context.get('request')
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
-        
-        if not start_date or not end_date:
-            return None
-            
-        return ProfitCalculator.calculate_profit(
-            obj.stock.prices,
-            start_date,
-            end_date,
-            obj.quantity
-        )
+        return self.get_valuation(obj.portfolio).get_profit(obj)
 
-class PortfolioSummarySerializer(DateValidationMixin, serializers.ModelSerializer):
+class PortfolioSummarySerializer(ProfiledSerializerMixin, PortfolioValuationMixin, serializers.ModelSerializer):
     stocks = PortfolioStockSerializer(many=True, source='holdings')
     total_value = serializers.SerializerMethodField()
     total_profit = serializers.SerializerMethodField()
@@ -71,28 +76,22 @@ class PortfolioSummarySerializer(DateValidationMixin, serializers.ModelSerialize
         read_only_fields = fields
 
     def get_total_value(self, portfolio):
-        portfolio_service = PortfolioService(portfolio)
-        return portfolio_service.calculate_total_value()
+        return self.get_valuation(portfolio).total_value
 
     def get_total_profit(self, portfolio):
-        request = self.context.get('request')
-        start_date = self.validate_dates(request.query_params.get('start_date'))
-        end_date = self.validate_dates(request.query_params.get('end_date'))
-        
-        if not start_date or not end_date:
-            return ZERO_PROFIT
-            
-        return ProfitCalculator.portfolio_profit(portfolio, start_date, end_date)
+        return self.get_valuation(portfolio).total_profit
     
     def get_annualized_return(self, portfolio):
-        request = self.context.get('request')
-        start_date = self.validate_dates(request.query_params.get('start_date'))
-        end_date = self.validate_dates(request.query_params.get('end_date'))
-        
-        if not start_date or not end_date:
-            return ZERO_PROFIT
-            
-        return ProfitCalculator.annualized_return(portfolio, start_date, end_date)
+        return self.get_valuation(portfolio).annualized_return
+
+class PortfolioListSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
+    holdings_count = serializers.IntegerField(read_only=True)
+    total_value = serializers.ReadOnlyField()
+
+    class Meta:
+        model = Portfolio
+        fields = ['id', 'name', 'created_at', 'holdings_count', 'total_value']
+        read_only_fields = fields
 
 class PortfolioCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -110,3 +109,36 @@ class AddStockSerializer(serializers.Serializer):
 
 class AddStocksToPortfolioSerializer(serializers.Serializer):
     stocks = AddStockSerializer(many=True)
+
+class PortfolioTimeseriesQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    interval = serializers.ChoiceField(choices=TIMESERIES_INTERVALS, default='day')
+
+    def validate(self, attrs):
+        attrs.setdefault('end', timezone.now().date())
+        attrs.setdefault('start', attrs['end'] - timedelta(
+            days=min(TIMESERIES_DEFAULT_DAYS, (attrs['end'] - date.min).days)
+        ))
+        if attrs['end'] < attrs['start']:
+            raise serializers.ValidationError({'end': "Must not be before start."})
+        if (attrs['end'] - attrs['start']).days > TIMESERIES_MAX_DAYS:
+            raise serializers.ValidationError(
+                {'end': f"Must not be more than {TIMESERIES_MAX_DAYS} days after start."}
+            )
+        return attrs
+
+class PortfolioBatchSummaryQuerySerializer(serializers.Serializer):
+    portfolios = serializers.ListField(
+        child=serializers.CharField(max_length=Portfolio._meta.get_field('name').max_length),
+        allow_empty=False,
+        max_length=PORTFOLIO_BATCH_MAX_SIZE
+    )
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        start_date, end_date = attrs.get('start_date'), attrs.get('end_date')
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError({'end_date': "Must not be before start_date."})
+        return attrs
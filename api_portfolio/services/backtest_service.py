@@ -0,0 +1,136 @@
+import csv
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+from itertools import repeat
+from multiprocessing import shared_memory
+import django
+import numpy as np
+from api_portfolio.db_router import replica_reads
+from api_portfolio.models import Holding
+from api_portfolio.services.portfolio_analytics import PortfolioAnalytics
+from api_portfolio.utils.constants import (
+    BACKTEST_CHUNK_SIZE,
+    BACKTEST_DEFAULT_WINDOW_DAYS,
+    BACKTEST_FIELDS,
+)
+
+# Shared price matrices this worker process is attached to, by name.
+_attached = {}
+
+
+def _shared_prices(name, shape):
+    if name not in _attached:
+        memory = shared_memory.SharedMemory(name=name)
+        _attached[name] = (memory, np.ndarray(shape, dtype=np.float64, buffer=memory.buf))
+    return _attached[name][1]
+
+
+def evaluate_chunk(name, shape, starts, ends, portfolios):
+    prices = _shared_prices(name, shape)
+    return [
+        (portfolio, PortfolioAnalytics.window_metrics(prices[rows], quantities, starts, ends))
+        for portfolio, rows, quantities in portfolios
+    ]
+
+
+class BacktestService:
+    """
+    Profit, initial investment and annualized return of many portfolios
+    over every rolling window of ``window_days`` in a date range.
+
+    The prices of every stock involved are loaded once into one
+    forward-filled matrix placed in shared memory. Worker processes attach
+    to it by name and value chunks of portfolios with
+    ``PortfolioAnalytics.window_metrics``, so workers neither query the
+    database nor receive a copy of the prices. Rows are written to CSV as
+    chunks complete.
+    """
+    def __init__(self, portfolios, start_date, end_date, window_days=BACKTEST_DEFAULT_WINDOW_DAYS,
+                 step_days=1, workers=None, chunk_size=BACKTEST_CHUNK_SIZE):
+        if window_days <= 0 or step_days <= 0:
+            raise ValueError("window_days and step_days must be positive")
+        if (end_date - start_date).days < window_days:
+            raise ValueError("The date range is shorter than one window")
+        self.portfolios = portfolios
+        self.start_date = start_date
+        self.end_date = end_date
+        self.window_days = window_days
+        self.step_days = step_days
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+    def windows(self):
+        ends = np.arange(self.window_days, (self.end_date - self.start_date).days + 1, self.step_days)
+        return ends - self.window_days, ends
+
+    @replica_reads()
+    def load_holdings(self):
+        """
+        (portfolio name, matrix rows, quantities) per portfolio and the
+        stock id of each matrix row.
+        """
+        holdings = {}
+        for portfolio_id, stock_id, quantity in Holding.objects.filter(
+            portfolio__in=self.portfolios
+        ).values_list('portfolio_id', 'stock_id', 'quantity'):
+            holdings.setdefault(portfolio_id, []).append((stock_id, float(quantity)))
+
+        stock_rows = {}
+        portfolios = []
+        for portfolio_id, name in self.portfolios.order_by('name').values_list('pk', 'name'):
+            positions = holdings.get(portfolio_id, [])
+            rows = [stock_rows.setdefault(stock_id, len(stock_rows)) for stock_id, _ in positions]
+            portfolios.append((
+                name,
+                np.array(rows, dtype=np.int64),
+                np.array([quantity for _, quantity in positions], dtype=np.float64),
+            ))
+        return portfolios, list(stock_rows)
+
+    def label(self, offsets):
+        return [(self.start_date + timedelta(days=int(offset))).isoformat() for offset in offsets]
+
+    def run(self, output, progress=None):
+        portfolios, stock_ids = self.load_holdings()
+        prices = PortfolioAnalytics.load_prices(stock_ids, self.start_date, self.end_date)
+        starts, ends = self.windows()
+        start_labels, end_labels = self.label(starts), self.label(ends)
+
+        writer = csv.writer(output)
+        writer.writerow(BACKTEST_FIELDS)
+        memory = shared_memory.SharedMemory(create=True, size=max(prices.nbytes, 1))
+        try:
+            np.ndarray(prices.shape, dtype=np.float64, buffer=memory.buf)[:] = prices
+            shape = prices.shape
+            del prices
+
+            done = 0
+            # Workers set Django up themselves when they are spawned rather
+            # than forked.
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=django.setup) as executor:
+                futures = [
+                    executor.submit(
+                        evaluate_chunk, memory.name, shape, starts, ends,
+                        portfolios[index:index + self.chunk_size]
+                    )
+                    for index in range(0, len(portfolios), self.chunk_size)
+                ]
+                for future in as_completed(futures):
+                    results = future.result()
+                    for name, metrics in results:
+                        writer.writerows(zip(
+                            repeat(name),
+                            start_labels,
+                            end_labels,
+                            metrics['profit'].round(4).tolist(),
+                            metrics['initial_investment'].round(4).tolist(),
+                            metrics['annualized_return'].round(6).tolist(),
+                        ))
+                    done += len(results)
+                    if progress:
+                        progress(done, len(portfolios))
+        finally:
+            memory.close()
+            memory.unlink()
+
+        return {'portfolios': len(portfolios), 'windows': len(ends), 'rows': len(portfolios) * len(ends)}
@@ -0,0 +1,52 @@
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from api_portfolio.models import LatestStockPrice, Stock, StockPrice
+from api_portfolio.utils.constants import LATEST_PRICE_REFRESH_BATCH_SIZE
+
+
+class LatestPriceService:
+    @staticmethod
+    def _latest(field):
+        return Subquery(
+            StockPrice.objects.filter(stock=OuterRef('pk'))
+            .order_by('-date')
+            .values(field)[:1]
+        )
+
+    @classmethod
+    def _refresh_batch(cls, stock_ids):
+        rows = (
+            Stock.objects.filter(pk__in=stock_ids)
+            .annotate(last_date=cls._latest('date'), last_price=cls._latest('price'))
+            .values_list('pk', 'last_date', 'last_price')
+        )
+        latest = [
+            LatestStockPrice(stock_id=stock_id, date=date, price=price)
+            for stock_id, date, price in rows
+            if date is not None
+        ]
+        LatestStockPrice.objects.filter(pk__in=stock_ids).exclude(
+            pk__in=[row.stock_id for row in latest]
+        ).delete()
+        LatestStockPrice.objects.bulk_create(
+            latest,
+            update_conflicts=True,
+            unique_fields=['stock'],
+            update_fields=['date', 'price', 'updated_at']
+        )
+        return len(latest)
+
+    @classmethod
+    def refresh(cls, stock_ids):
+        stock_ids = list(stock_ids)
+        refreshed = 0
+        with transaction.atomic():
+            for i in range(0, len(stock_ids), LATEST_PRICE_REFRESH_BATCH_SIZE):
+                refreshed += cls._refresh_batch(
+                    stock_ids[i:i + LATEST_PRICE_REFRESH_BATCH_SIZE]
+                )
+        return refreshed
+
+    @classmethod
+    def rebuild(cls):
+        return cls.refresh(Stock.objects.values_list('pk', flat=True))
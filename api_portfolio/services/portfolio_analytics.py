@@ -0,0 +1,218 @@
+from datetime import timedelta
+import numpy as np
+from django.db.models import Min
+from api_portfolio.db_router import replica_reads
+from api_portfolio.models import StockPrice
+from api_portfolio.services.price_resolver import PriceResolver
+from api_portfolio.services.price_store import ColumnarPriceStore, get_price_store
+from api_portfolio.services.profit_calculator import ProfitCalculator
+from api_portfolio.utils.constants import (
+    YEAR_DAYS,
+    ZERO_ANNUALIZED_RETURN,
+)
+
+
+class PortfolioAnalytics:
+    """
+    Vectorized portfolio analytics over a (holdings x calendar days) price
+    matrix loaded once from StockPrice, or from the columnar price store for
+    stocks it holds up to date.
+
+    Gaps are forward-filled so every cell holds the latest price on or
+    before that day, the same value ``latest('date')`` returns, and cells
+    before a stock's first price stay NaN. Holdings without a price at a
+    date are skipped exactly like ProfitCalculator skips them.
+
+    Values are float64, so results match the Decimal path of
+    ProfitCalculator within ANALYTICS_RELATIVE_TOLERANCE (see
+    ``compare_with_decimal``), not to the cent.
+    """
+    def __init__(self, portfolio, start_date, end_date):
+        if end_date < start_date:
+            raise ValueError("end_date must not be before start_date")
+        self.portfolio = portfolio
+        self.start_date = start_date
+        self.end_date = end_date
+        self.holdings = list(portfolio.holdings.all())
+        self.quantities = np.array(
+            [float(holding.quantity) for holding in self.holdings], dtype=np.float64
+        )
+        self.dates = np.arange(
+            np.datetime64(start_date, 'D'),
+            np.datetime64(end_date, 'D') + 1,
+        )
+        self.prices = self._load_prices()
+
+    def _load_prices(self):
+        return self.load_prices(
+            [holding.stock_id for holding in self.holdings], self.start_date, self.end_date
+        )
+
+    @staticmethod
+    @replica_reads()
+    def first_price_date(stock_ids):
+        return StockPrice.objects.filter(stock_id__in=stock_ids).aggregate(
+            first=Min('date')
+        )['first']
+
+    @classmethod
+    @replica_reads()
+    def load_prices(cls, stock_ids, start_date, end_date):
+        """
+        Forward-filled (stocks x calendar days) float64 matrix, one row per
+        entry of ``stock_ids``, read from the replica when there is one.
+        """
+        rows = {stock_id: index for index, stock_id in enumerate(stock_ids)}
+        matrix = np.full((len(stock_ids), (end_date - start_date).days + 1), np.nan)
+        if not rows:
+            return matrix
+
+        store = get_price_store()
+        if store.enabled:
+            for stock_id in store.fresh_stock_ids(list(rows)):
+                series = store.series(stock_id)
+                row = rows.pop(stock_id)
+                if series is None:
+                    continue
+                opening, offsets, prices = ColumnarPriceStore.window(series, start_date, end_date)
+                if opening is not None:
+                    matrix[row, 0] = opening
+                matrix[row, offsets] = prices
+            if not rows:
+                return cls.forward_fill(matrix)
+
+        opening = PriceResolver(list(rows), [start_date])
+        for stock_id, row in rows.items():
+            price = opening.get_price(stock_id, start_date)
+            if price is not None:
+                matrix[row, 0] = float(price)
+
+        history = StockPrice.objects.filter(
+            stock_id__in=rows,
+            date__gt=start_date,
+            date__lte=end_date,
+        ).values_list('stock_id', 'date', 'price')
+        for stock_id, date, price in history.iterator():
+            matrix[rows[stock_id], (date - start_date).days] = float(price)
+
+        return cls.forward_fill(matrix)
+
+    @staticmethod
+    def forward_fill(matrix):
+        if matrix.size == 0:
+            return matrix
+        columns = np.arange(matrix.shape[1])
+        last_seen = np.where(np.isnan(matrix), 0, columns)
+        np.maximum.accumulate(last_seen, axis=1, out=last_seen)
+        return matrix[np.arange(matrix.shape[0])[:, None], last_seen]
+
+    def _index(self, dates):
+        offsets = np.array([(date - self.start_date).days for date in dates], dtype=np.int64)
+        if offsets.size and (offsets.min() < 0 or offsets.max() >= len(self.dates)):
+            raise ValueError("Dates must fall inside the loaded range")
+        return offsets
+
+    def values(self):
+        return np.nansum(self.quantities[:, None] * self.prices, axis=0)
+
+    def evaluate(self, ranges):
+        """
+        Profit, initial investment and annualized return for many
+        (start_date, end_date) pairs in one pass. Returns float64 arrays.
+        """
+        starts = self._index([start for start, _ in ranges])
+        ends = self._index([end for _, end in ranges])
+        return self.window_metrics(self.prices, self.quantities, starts, ends)
+
+    @staticmethod
+    def window_metrics(prices, quantities, starts, ends):
+        """
+        ``evaluate`` over a price matrix and day offsets into its columns.
+        """
+        start_prices = prices[:, starts]
+        end_prices = prices[:, ends]
+        quantities = quantities[:, None]
+
+        priced = ~(np.isnan(start_prices) | np.isnan(end_prices))
+        profits = np.where(priced, (end_prices - start_prices) * quantities, 0).sum(axis=0)
+        initial = np.nansum(start_prices * quantities, axis=0)
+        years = (ends - starts) / YEAR_DAYS
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            annualized = (1 + profits / initial) ** (1 / years) - 1
+        valid = (initial != 0) & (years > 0) & np.isfinite(annualized)
+        annualized = np.where(valid, annualized, ZERO_ANNUALIZED_RETURN)
+
+        return {
+            'profit': profits,
+            'initial_investment': initial,
+            'annualized_return': annualized,
+        }
+
+    def rolling_returns(self, window_days):
+        if window_days <= 0 or window_days >= len(self.dates):
+            return np.array([])
+        ends = self.dates[window_days:].astype(object)
+        ranges = [(end - timedelta(days=window_days), end) for end in ends]
+        result = self.evaluate(ranges)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = result['profit'] / result['initial_investment']
+        return np.where(result['initial_investment'] != 0, returns, 0.0)
+
+    def drawdowns(self):
+        values = self.values()
+        peaks = np.maximum.accumulate(values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdowns = values / peaks - 1
+        return np.where(peaks > 0, drawdowns, 0.0)
+
+    def sample_indexes(self, interval, max_points):
+        days = self.dates.astype(np.int64)
+        if interval == 'week':
+            # datetime64 day 0 is a Thursday; shift so weeks run Monday-Sunday
+            periods = (days + 3) // 7
+        elif interval == 'month':
+            periods = self.dates.astype('datetime64[M]').astype(np.int64)
+        else:
+            periods = days
+
+        period_ends = np.flatnonzero(periods[1:] != periods[:-1])
+        indexes = np.unique(np.concatenate(([0], period_ends, [len(self.dates) - 1])))
+        if len(indexes) > max_points:
+            # The last point always closes the series, inside the limit.
+            stride = -(-len(indexes) // max_points)
+            indexes = np.unique(np.append(indexes[::stride][:max_points - 1], indexes[-1]))
+        return indexes
+
+    def timeseries(self, interval, max_points):
+        indexes = self.sample_indexes(interval, max_points)
+        dates = self.dates[indexes].astype(object)
+        values = self.values()[indexes]
+        profits = self.evaluate([(self.start_date, date) for date in dates])['profit']
+        return [
+            {'date': date, 'value': round(float(value), 4), 'profit': round(float(profit), 4)}
+            for date, value, profit in zip(dates, values, profits)
+        ]
+
+    def compare_with_decimal(self, ranges):
+        """
+        Largest relative difference from ProfitCalculator over ``ranges``
+        for profit and annualized return.
+        """
+        result = self.evaluate(ranges)
+        errors = {'profit': 0.0, 'annualized_return': 0.0}
+        for index, (start_date, end_date) in enumerate(ranges):
+            prices = PriceResolver.for_holdings(self.holdings, [start_date, end_date])
+            expected = {
+                'profit': ProfitCalculator.portfolio_profit(
+                    self.portfolio, start_date, end_date, prices
+                ),
+                'annualized_return': ProfitCalculator.annualized_return(
+                    self.portfolio, start_date, end_date, prices
+                ),
+            }
+            for metric, value in expected.items():
+                value = float(value)
+                difference = abs(result[metric][index] - value)
+                errors[metric] = max(errors[metric], difference / max(abs(value), 1.0))
+        return errors
@@ -0,0 +1,43 @@
+from itertools import islice
+from api_portfolio.models import Portfolio
+from api_portfolio.services.portfolio_valuation import PortfolioValuation
+from api_portfolio.services.price_resolver import PriceResolver
+from api_portfolio.utils.constants import PORTFOLIO_BATCH_CHUNK_SIZE
+
+
+class PortfolioBatchValuation:
+    """
+    Values many portfolios over one date range. The prices of every stock
+    held by any of them are resolved once up front; portfolios are then
+    loaded and valued a chunk at a time, in the order they were asked for,
+    so callers can stream the results. A name asked for twice is answered
+    twice.
+    """
+    def __init__(self, queryset, names, start_date=None, end_date=None,
+                 chunk_size=PORTFOLIO_BATCH_CHUNK_SIZE):
+        self.queryset = queryset
+        self.names = list(names)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.chunk_size = chunk_size
+        dates = [start_date, end_date] if start_date and end_date else []
+        self.prices = PriceResolver.for_portfolios(
+            Portfolio.objects.filter(name__in=set(self.names)), dates
+        )
+
+    def chunks(self):
+        """
+        Yields lists of (name, PortfolioValuation), with None for names that
+        match no portfolio.
+        """
+        self.prices.resolve()
+        names = iter(self.names)
+        while chunk := list(islice(names, self.chunk_size)):
+            valuations = {
+                portfolio.name: self.value(portfolio)
+                for portfolio in self.queryset.filter(name__in=set(chunk))
+            }
+            yield [(name, valuations.get(name)) for name in chunk]
+
+    def value(self, portfolio):
+        return PortfolioValuation(portfolio, self.start_date, self.end_date, self.prices)
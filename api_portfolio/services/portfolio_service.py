@@ -1,46 +1,190 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from decimal import Decimal
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
-from api_portfolio.models import Holding
+from api_portfolio.models import Holding, LatestStockPrice, Portfolio, Stock
+from api_portfolio.services.price_resolver import PriceResolver
 from api_portfolio.services.stock_service import StockService
+from api_portfolio.utils.constants import BULK_BATCH_SIZE
+from api_portfolio.utils.fixed_point import quantity_units, to_value
+
+_pending_touches = ContextVar('pending_touches', default=None)
+
 
 class PortfolioService:
     def __init__(self, portfolio):
         self.portfolio = portfolio
 
-    def calculate_total_value(self):
-        total = Decimal('0')
+    @staticmethod
+    def with_list_fields(queryset):
+        # Correlated per-portfolio subqueries keep the outer query free of a
+        # GROUP BY, so a page only touches the holdings index of its rows.
+        holdings = Holding.objects.filter(portfolio=OuterRef('pk')).order_by().values('portfolio')
+        return queryset.annotate(
+            holdings_count=Coalesce(
+                Subquery(holdings.annotate(count=Count('pk')).values('count')),
+                Value(0)
+            ),
+            total_value=Coalesce(
+                Subquery(holdings.annotate(
+                    value=Sum(F('quantity') * F('stock__latest_price__price'))
+                ).values('value')),
+                Value(Decimal('0')),
+                output_field=DecimalField()
+            )
+        )
+
+    @staticmethod
+    def with_validators(queryset):
+        # Holding changes touch updated_at and every price write refreshes
+        # the stock's LatestStockPrice row, so the two timestamps change
+        # whenever a valuation of the portfolio can.
+        return queryset.annotate(
+            prices_updated_at=Subquery(
+                LatestStockPrice.objects.filter(stock__holding__portfolio=OuterRef('pk'))
+                .order_by('-updated_at').values('updated_at')[:1]
+            )
+        )
+
+    @staticmethod
+    def touch(portfolio_ids):
+        # Holding writes change past valuations; updated_at marks the
+        # portfolio's daily value snapshots as stale and moves its cached
+        # summaries to new keys.
+        pending = _pending_touches.get()
+        if pending is not None:
+            pending.update(portfolio_ids)
+            return
+        Portfolio.objects.filter(pk__in=portfolio_ids).update(updated_at=timezone.now())
+
+    @classmethod
+    @contextmanager
+    def touch_once(cls):
+        """Collects the touches of the block into one UPDATE at its end."""
+        if _pending_touches.get() is not None:
+            yield
+            return
+        pending = set()
+        token = _pending_touches.set(pending)
+        try:
+            yield
+        finally:
+            _pending_touches.reset(token)
+            if pending:
+                cls.touch(pending)
+
+    def calculate_total_value(self, prices=None):
+        if prices is None:
+            prices = PriceResolver.for_portfolio(self.portfolio)
+        total = 0
         for holding in self.portfolio.holdings.all():
-            price = StockService.get_current_price(holding.stock)
-            total += Decimal(price) * Decimal(holding.quantity)
-        return total
+            price = prices.get_units(holding.stock_id)
+            if price is None:
+                continue
+            total += price * quantity_units(holding.quantity)
+        return to_value(total)
 
     def add_stocks_to_portfolio(self, stocks_data):
         created = 0
         updated = 0
         
+        # Each holding save touches the portfolio; one UPDATE is enough.
+        with self.touch_once():
+            for stock_data in stocks_data:
+                symbol = stock_data['symbol'].upper()
+                quantity = Decimal(stock_data['quantity'])
+                purchase_date = stock_data.get('purchase_date', timezone.now().date())
+                
+                stock, _ = StockService.get_or_create_stock(symbol)
+                
+                holding, is_created = Holding.objects.get_or_create(
+                    portfolio=self.portfolio,
+                    stock=stock,
+                    defaults={
+                        'quantity': quantity,
+                        'purchase_date': purchase_date
+                    }
+                )
+                
+                if not is_created:
+                    holding.quantity += quantity
+                    if purchase_date < holding.purchase_date:
+                        holding.purchase_date = purchase_date
+                    holding.save()
+                    updated += 1
+                else:
+                    created += 1
+                
+        return created, updated
+
+
+    @staticmethod
+    def merge_stocks_data(stocks_data):
+        today = timezone.now().date()
+        merged = {}
         for stock_data in stocks_data:
             symbol = stock_data['symbol'].upper()
             quantity = Decimal(stock_data['quantity'])
-            purchase_date = stock_data.get('purchase_date', timezone.now().date())
-            
-            stock, _ = StockService.get_or_create_stock(symbol)
-            
-            holding, is_created = Holding.objects.get_or_create(
-                portfolio=self.portfolio,
-                stock=stock,
-                defaults={
-                    'quantity': quantity,
-                    'purchase_date': purchase_date
-                }
-            )
-            
-            if not is_created:
-                holding.quantity += quantity
-                if purchase_date < holding.purchase_date:
-                    holding.purchase_date = purchase_date
-                holding.save()
-                updated += 1
+            purchase_date = stock_data.get('purchase_date', today)
+
+            if symbol in merged:
+                merged[symbol]['quantity'] += quantity
+                merged[symbol]['purchase_date'] = min(
+                    merged[symbol]['purchase_date'], purchase_date
+                )
             else:
-                created += 1
-                
-        return created, updated
+                merged[symbol] = {'quantity': quantity, 'purchase_date': purchase_date}
+        return merged
+
+    def bulk_add_stocks_to_portfolio(self, stocks_data):
+        merged = self.merge_stocks_data(stocks_data)
+        if not merged:
+            return 0, 0
+
+        with transaction.atomic():
+            Stock.objects.bulk_create(
+                [Stock(symbol=symbol) for symbol in merged],
+                batch_size=BULK_BATCH_SIZE,
+                ignore_conflicts=True
+            )
+            stock_ids = dict(
+                Stock.objects.filter(symbol__in=merged).values_list('symbol', 'pk')
+            )
+            existing = {
+                holding.stock_id: holding
+                for holding in Holding.objects.select_for_update().filter(
+                    portfolio=self.portfolio,
+                    stock_id__in=stock_ids.values()
+                )
+            }
+
+            to_create = []
+            to_update = []
+            for symbol, stock_data in merged.items():
+                holding = existing.get(stock_ids[symbol])
+                if holding is None:
+                    to_create.append(Holding(
+                        portfolio=self.portfolio,
+                        stock_id=stock_ids[symbol],
+                        quantity=stock_data['quantity'],
+                        purchase_date=stock_data['purchase_date']
+                    ))
+                    continue
+
+                holding.quantity += stock_data['quantity']
+                if stock_data['purchase_date'] < holding.purchase_date:
+                    holding.purchase_date = stock_data['purchase_date']
+                to_update.append(holding)
+
+            Holding.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+            Holding.objects.bulk_update(
+                to_update,
+                ['quantity', 'purchase_date'],
+                batch_size=BULK_BATCH_SIZE
+            )
+            self.touch([self.portfolio.pk])
+
+        return len(to_create), len(to_update)
@@ -0,0 +1,162 @@
+from collections import defaultdict
+from datetime import timedelta
+from itertools import islice
+from django.db import transaction
+from django.db.models import Max, Min, OuterRef, Subquery
+from django.utils import timezone
+from api_portfolio.models import Holding, Portfolio, PortfolioDailyValue, StockPrice
+from api_portfolio.services.price_resolver import PriceResolver
+from api_portfolio.utils.constants import BULK_BATCH_SIZE, PRICE_EXPORT_CHUNK_SIZE
+from api_portfolio.utils.fixed_point import price_units, quantity_units, to_value
+
+
+class PortfolioSnapshotService:
+    """
+    Daily values of each portfolio at its current holdings, stored in
+    PortfolioDailyValue.
+
+    A snapshot is only trusted when it was computed after the portfolio's
+    ``updated_at``, which holding changes touch. Price writes delete the
+    snapshots on or after the written date, and ``refresh`` recomputes a
+    portfolio from its last remaining snapshot, or from scratch when its
+    holdings changed. ``complete`` marks days where every holding has a
+    price; from such a day, profit is the difference of two snapshots.
+    """
+    @staticmethod
+    def daily_values(holdings, start_date, end_date):
+        # Values are fixed-point units (see utils.fixed_point).
+        quantities = {holding.stock_id: quantity_units(holding.quantity) for holding in holdings}
+        opening = PriceResolver(list(quantities), [start_date])
+        prices = {}
+        value = 0
+        for stock_id, quantity in quantities.items():
+            price = opening.get_units(stock_id, start_date)
+            if price is not None:
+                prices[stock_id] = price
+                value += price * quantity
+
+        changes = defaultdict(list)
+        history = StockPrice.objects.filter(
+            stock_id__in=quantities,
+            date__gt=start_date,
+            date__lte=end_date,
+        ).order_by().values_list('stock_id', 'date', 'price')
+        for stock_id, date, price in history.iterator(chunk_size=PRICE_EXPORT_CHUNK_SIZE):
+            changes[date].append((stock_id, price))
+
+        day = start_date
+        while day <= end_date:
+            for stock_id, price in changes.get(day, ()):
+                price = price_units(price)
+                value += (price - prices.get(stock_id, 0)) * quantities[stock_id]
+                prices[stock_id] = price
+            yield day, value, len(prices) == len(quantities)
+            day += timedelta(days=1)
+
+    @classmethod
+    def refresh_portfolio(cls, portfolio, last_date=None, until=None):
+        until = until or timezone.now().date()
+        computed_at = timezone.now()
+
+        with transaction.atomic():
+            holdings = list(Holding.objects.filter(portfolio=portfolio))
+            if last_date is None:
+                PortfolioDailyValue.objects.filter(portfolio=portfolio).delete()
+                start_date = StockPrice.objects.filter(
+                    stock_id__in=[holding.stock_id for holding in holdings]
+                ).aggregate(first=Min('date'))['first']
+            else:
+                start_date = last_date + timedelta(days=1)
+
+            if not holdings or start_date is None or start_date > until:
+                return 0
+
+            snapshots = (
+                PortfolioDailyValue(
+                    portfolio=portfolio,
+                    date=date,
+                    value_units=value,
+                    complete=complete,
+                    computed_at=computed_at
+                )
+                for date, value, complete in cls.daily_values(holdings, start_date, until)
+            )
+            written = 0
+            while batch := list(islice(snapshots, BULK_BATCH_SIZE)):
+                PortfolioDailyValue.objects.bulk_create(batch)
+                written += len(batch)
+        return written
+
+    @classmethod
+    def refresh(cls, portfolios=None, rebuild=False, until=None):
+        """
+        Brings the snapshots of ``portfolios`` (default: all) up to
+        ``until``. Returns (portfolios refreshed, snapshots written).
+        """
+        queryset = Portfolio.objects.all() if portfolios is None else portfolios
+        queryset = queryset.annotate(
+            last_snapshot=Max('daily_values__date'),
+            oldest_snapshot=Min('daily_values__computed_at'),
+        ).order_by('id')
+
+        refreshed = 0
+        written = 0
+        for portfolio in queryset:
+            stale = rebuild or (
+                portfolio.oldest_snapshot is not None
+                and portfolio.oldest_snapshot < portfolio.updated_at
+            )
+            count = cls.refresh_portfolio(
+                portfolio,
+                None if stale else portfolio.last_snapshot,
+                until
+            )
+            if count:
+                refreshed += 1
+                written += count
+        return refreshed, written
+
+    @staticmethod
+    def invalidate(stock_dates):
+        stocks_by_date = defaultdict(list)
+        for stock_id, from_date in stock_dates.items():
+            stocks_by_date[from_date].append(stock_id)
+
+        for from_date, stock_ids in stocks_by_date.items():
+            PortfolioDailyValue.objects.filter(
+                portfolio__in=Holding.objects.filter(stock_id__in=stock_ids).values('portfolio'),
+                date__gte=from_date
+            ).delete()
+
+    @staticmethod
+    def _snapshot_value(date, complete=False):
+        snapshots = PortfolioDailyValue.objects.filter(
+            portfolio=OuterRef('pk'),
+            date=date,
+            computed_at__gte=OuterRef('updated_at')
+        )
+        if complete:
+            snapshots = snapshots.filter(complete=True)
+        return Subquery(snapshots.values('value_units')[:1])
+
+    @classmethod
+    def with_range_values(cls, queryset, start_date, end_date):
+        return queryset.annotate(
+            snapshot_start_value=cls._snapshot_value(start_date, complete=True),
+            snapshot_end_value=cls._snapshot_value(end_date),
+        )
+
+    @classmethod
+    def range_values(cls, portfolio, start_date, end_date):
+        """
+        (start value, end value) when fresh snapshots cover the range and
+        every holding is priced at ``start_date``; None otherwise.
+        """
+        if end_date < start_date:
+            return None
+        values = cls.with_range_values(
+            Portfolio.objects.filter(pk=portfolio.pk), start_date, end_date
+        ).values_list('snapshot_start_value', 'snapshot_end_value').first()
+        if values is None or None in values:
+            return None
+        return tuple(to_value(value) for value in values)
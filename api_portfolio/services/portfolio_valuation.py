@@ -0,0 +1,83 @@
+from api_portfolio.services.price_resolver import PriceResolver
+from api_portfolio.services.profit_calculator import ProfitCalculator
+from api_portfolio.utils.constants import ZERO_PROFIT
+from api_portfolio.utils.fixed_point import quantity_units, to_value
+from api_portfolio.utils.profiling import profile_section
+
+
+class PortfolioValuation:
+    """
+    Values a portfolio once for a request: holdings, resolved prices,
+    per-holding profits and totals. Serializers only render its fields.
+
+    Sums are kept as fixed-point integers (see utils.fixed_point) and
+    become Decimals only when a serializer reads them.
+    """
+    def __init__(self, portfolio, start_date=None, end_date=None, prices=None):
+        self.portfolio = portfolio
+        self.start_date = start_date
+        self.end_date = end_date
+        self.has_range = bool(start_date and end_date)
+        dates = [start_date, end_date] if self.has_range else []
+        self.holdings = list(portfolio.holdings.all())
+        self.prices = prices or PriceResolver.for_holdings(self.holdings, dates)
+
+        self.current_prices = {}
+        self.profit_units = {}
+        self.total_value_units = 0
+        self.total_profit_units = 0
+        self.initial_investment_units = 0
+        self.annualized_return = ZERO_PROFIT
+        with profile_section('valuation'):
+            self._compute()
+
+    def _compute(self):
+        total_profit = 0
+        for holding in self.holdings:
+            quantity = quantity_units(holding.quantity)
+            self.current_prices[holding.stock_id] = self.prices.get_price(holding.stock_id)
+            current_price = self.prices.get_units(holding.stock_id)
+            if current_price is not None:
+                self.total_value_units += current_price * quantity
+
+            if not self.has_range:
+                continue
+
+            profit = ProfitCalculator.holding_profit_units(
+                holding, self.start_date, self.end_date, self.prices, quantity
+            )
+            self.profit_units[holding.pk] = profit
+            if profit is not None:
+                total_profit += profit
+
+            start_price = self.prices.get_units(holding.stock_id, self.start_date)
+            if start_price is not None:
+                self.initial_investment_units += start_price * quantity
+
+        if self.has_range:
+            self.total_profit_units = total_profit
+            self.annualized_return = ProfitCalculator.annualize(
+                to_value(total_profit),
+                self.initial_investment,
+                self.start_date,
+                self.end_date
+            )
+
+    @property
+    def total_value(self):
+        return to_value(self.total_value_units)
+
+    @property
+    def total_profit(self):
+        return to_value(self.total_profit_units) if self.has_range else ZERO_PROFIT
+
+    @property
+    def initial_investment(self):
+        return to_value(self.initial_investment_units)
+
+    def get_current_price(self, holding):
+        return self.current_prices.get(holding.stock_id)
+
+    def get_profit(self, holding):
+        profit = self.profit_units.get(holding.pk)
+        return None if profit is None else to_value(profit)
@@ -0,0 +1,144 @@
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils import timezone
+from api_portfolio.utils.constants import PRICE_CACHE_DEFAULT_MAX_SIZE, PRICE_CACHE_KEY_PREFIX
+
+
+class PriceCache:
+    """
+    Two-tier cache of resolved prices keyed by (stock id, as-of date).
+
+    The first tier is a bounded in-process LRU; the second is an optional
+    Django cache backend shared between processes. Only past as-of dates
+    are cached; current prices are read with the stock's LatestStockPrice
+    row on every resolve. Each entry holds (version, price), where the
+    version is that row's ``updated_at``: every price write moves it, so
+    an entry stored before a write, by any process, no longer matches and
+    is read again. ``invalidate`` only frees the local tier.
+    """
+    def __init__(self, max_size=PRICE_CACHE_DEFAULT_MAX_SIZE, cache_alias=None):
+        self.max_size = max_size
+        self.cache_alias = cache_alias
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_settings(cls):
+        options = getattr(settings, 'PRICE_CACHE', {})
+        return cls(
+            max_size=options.get('MAX_SIZE', PRICE_CACHE_DEFAULT_MAX_SIZE),
+            cache_alias=options.get('CACHE_ALIAS'),
+        )
+
+    @property
+    def enabled(self):
+        return self.max_size > 0 or self.cache_alias is not None
+
+    @property
+    def shared(self):
+        return caches[self.cache_alias] if self.cache_alias else None
+
+    @staticmethod
+    def make_key(stock_id, as_of):
+        return f'{PRICE_CACHE_KEY_PREFIX}:{stock_id}:{as_of.isoformat()}'
+
+    @staticmethod
+    def is_cacheable(as_of):
+        return as_of is not None and as_of < timezone.now().date()
+
+    def get_many(self, keys):
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+                    self.hits += 1
+                else:
+                    missing.append(key)
+
+        if missing and self.shared is not None:
+            cache_keys = {self.make_key(*key): key for key in missing}
+            shared = self.shared.get_many(cache_keys)
+            shared = {cache_keys[cache_key]: value for cache_key, value in shared.items()}
+            found.update(shared)
+            self._store(shared)
+            with self._lock:
+                self.shared_hits += len(shared)
+
+        with self._lock:
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, values):
+        values = {
+            key: value for key, value in values.items()
+            if value is not None and self.is_cacheable(key[1])
+        }
+        self._store(values)
+        if values and self.shared is not None:
+            self.shared.set_many(
+                {self.make_key(*key): value for key, value in values.items()},
+                timeout=None
+            )
+
+    def _store(self, values):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, stock_id, from_date):
+        with self._lock:
+            stale = [
+                key for key in self._entries
+                if key[0] == stock_id and key[1] >= from_date
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.shared_hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+_price_cache = None
+
+
+def get_price_cache():
+    global _price_cache
+    if _price_cache is None:
+        _price_cache = PriceCache.from_settings()
+    return _price_cache
+
+
+@receiver(setting_changed)
+def reset_price_cache(setting, **kwargs):
+    global _price_cache
+    if setting in ('PRICE_CACHE', 'CACHES'):
+        _price_cache = None
@@ -0,0 +1,87 @@
+import csv
+import itertools
+import json
+from api_portfolio.utils.constants import PRICE_EXPORT_BUFFER_SIZE, PRICE_EXPORT_CHUNK_SIZE
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+class PriceExportService:
+    FIELDS = ['date', 'price']
+
+    def __init__(self, prices):
+        self.prices = prices
+
+    @property
+    def rows(self):
+        return self.prices.values_list(*self.FIELDS).iterator(chunk_size=PRICE_EXPORT_CHUNK_SIZE)
+
+    @property
+    def arows(self):
+        # Plain values_list() runs its query as soon as the iterator is
+        # created, which aiterator() does in the event loop; named rows are
+        # produced lazily.
+        return self.prices.values_list(*self.FIELDS, named=True).aiterator(
+            chunk_size=PRICE_EXPORT_CHUNK_SIZE
+        )
+
+    @staticmethod
+    def ndjson_line(date, price):
+        return json.dumps({'date': date.isoformat(), 'price': str(price)}) + '\n'
+
+    @staticmethod
+    def _buffered(lines):
+        buffer = []
+        size = 0
+        for line in lines:
+            buffer.append(line)
+            size += len(line)
+            if size >= PRICE_EXPORT_BUFFER_SIZE:
+                yield ''.join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield ''.join(buffer)
+
+    @staticmethod
+    async def _abuffered(lines):
+        buffer = []
+        size = 0
+        async for line in lines:
+            buffer.append(line)
+            size += len(line)
+            if size >= PRICE_EXPORT_BUFFER_SIZE:
+                yield ''.join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield ''.join(buffer)
+
+    def ndjson(self):
+        return self._buffered(self.ndjson_line(*row) for row in self.rows)
+
+    def csv(self):
+        writer = csv.writer(Echo())
+        return self._buffered(
+            writer.writerow(row)
+            for row in itertools.chain([self.FIELDS], self.rows)
+        )
+
+    async def _andjson_lines(self):
+        async for row in self.arows:
+            yield self.ndjson_line(*row)
+
+    async def _acsv_lines(self):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.FIELDS)
+        async for row in self.arows:
+            yield writer.writerow(row)
+
+    def andjson(self):
+        return self._abuffered(self._andjson_lines())
+
+    def acsv(self):
+        return self._abuffered(self._acsv_lines())
@@ -0,0 +1,155 @@
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from django.db import transaction
+from django.utils.dateparse import parse_date
+from api_portfolio.models import Stock, StockPrice
+from api_portfolio.signals import notify_prices_written
+from api_portfolio.utils.constants import (
+    BULK_BATCH_SIZE,
+    MAX_LENGTH_PRICE,
+    MAX_LENGTH_PRICE_DECIMAL_PLACES,
+    PRICE_INGEST_CHUNK_SIZE,
+    PRICE_INGEST_FIELDS,
+    PRICE_INGEST_MAX_ERRORS,
+)
+
+
+class PriceRowError(ValueError):
+    pass
+
+
+class PriceIngestionService:
+    """
+    Upserts (symbol, date, price) rows read from a stream.
+
+    Rows are consumed in chunks of PRICE_INGEST_CHUNK_SIZE, so memory stays
+    bounded whatever the size of the upload. Each chunk resolves its symbols
+    in one query and is written in its own transaction. Invalid rows are
+    reported with their line number and skipped; they never abort the rest
+    of the upload.
+    """
+    def __init__(self, chunk_size=PRICE_INGEST_CHUNK_SIZE, max_errors=PRICE_INGEST_MAX_ERRORS):
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.received = 0
+        self.upserted = 0
+        self.error_count = 0
+        self.errors = []
+
+    @staticmethod
+    def read_csv(lines):
+        reader = csv.DictReader(lines)
+        missing = set(PRICE_INGEST_FIELDS) - set(reader.fieldnames or [])
+        if missing:
+            raise PriceRowError(f"CSV header is missing columns: {', '.join(sorted(missing))}")
+        for row in reader:
+            yield reader.line_num, row
+
+    @staticmethod
+    def read_ndjson(lines):
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield line_number, PriceRowError("Invalid JSON")
+                continue
+            if not isinstance(row, dict):
+                yield line_number, PriceRowError("Expected a JSON object")
+                continue
+            yield line_number, row
+
+    @staticmethod
+    def clean(row):
+        if isinstance(row, PriceRowError):
+            raise row
+
+        symbol = str(row.get('symbol') or '').strip().upper()
+        if not symbol:
+            raise PriceRowError("symbol is required")
+
+        try:
+            date = parse_date(str(row.get('date') or '').strip()) if row.get('date') else None
+        except ValueError:
+            # Well formed, but not a calendar date (e.g. 2024-02-30)
+            date = None
+        if date is None:
+            raise PriceRowError("date must be YYYY-MM-DD")
+
+        try:
+            price = Decimal(str(row.get('price')).strip())
+        except (InvalidOperation, ValueError):
+            raise PriceRowError("price must be a number")
+        if not price.is_finite() or price <= 0:
+            raise PriceRowError("price must be positive")
+        if price.as_tuple().exponent < -MAX_LENGTH_PRICE_DECIMAL_PLACES:
+            raise PriceRowError(
+                f"price has more than {MAX_LENGTH_PRICE_DECIMAL_PLACES} decimal places"
+            )
+        if price >= 10 ** (MAX_LENGTH_PRICE - MAX_LENGTH_PRICE_DECIMAL_PLACES):
+            raise PriceRowError("price is too large")
+
+        return symbol, date, price
+
+    def add_error(self, line_number, message):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'line': line_number, 'error': message})
+
+    def ingest_chunk(self, rows):
+        cleaned = []
+        for line_number, row in rows:
+            try:
+                cleaned.append((line_number, *self.clean(row)))
+            except PriceRowError as exc:
+                self.add_error(line_number, str(exc))
+
+        stock_ids = dict(
+            Stock.objects.filter(symbol__in={symbol for _, symbol, _, _ in cleaned})
+            .values_list('symbol', 'pk')
+        )
+
+        # One row per (stock, date); a later line overrides an earlier one,
+        # as it would have in separate uploads.
+        prices = {}
+        for line_number, symbol, date, price in cleaned:
+            if symbol not in stock_ids:
+                self.add_error(line_number, f"Unknown symbol {symbol}")
+                continue
+            prices[(stock_ids[symbol], date)] = price
+
+        stock_dates = {}
+        for stock_id, date in prices:
+            stock_dates[stock_id] = min(date, stock_dates.get(stock_id, date))
+
+        with transaction.atomic():
+            StockPrice.objects.bulk_create(
+                [
+                    StockPrice(stock_id=stock_id, date=date, price=price)
+                    for (stock_id, date), price in prices.items()
+                ],
+                batch_size=BULK_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['stock', 'date'],
+                update_fields=['price']
+            )
+            notify_prices_written(stock_dates)
+        self.upserted += len(prices)
+
+    def ingest(self, rows):
+        rows = iter(rows)
+        while chunk := list(islice(rows, self.chunk_size)):
+            self.received += len(chunk)
+            self.ingest_chunk(chunk)
+        return self.report()
+
+    def report(self):
+        return {
+            'received': self.received,
+            'upserted': self.upserted,
+            'error_count': self.error_count,
+            'errors': sorted(self.errors, key=lambda error: error['line']),
+        }
@@ -0,0 +1,208 @@
+from asgiref.sync import sync_to_async
+from django.db.models import F, OuterRef, QuerySet, Subquery
+from api_portfolio.models import Stock, StockPrice
+from api_portfolio.services.price_cache import get_price_cache
+from api_portfolio.utils.fixed_point import price_units
+
+
+class PriceResolver:
+    """
+    Resolves "latest price on or before a date" for many stocks at once.
+
+    Every (stock, as-of date) pair is fetched in a single query, one
+    correlated subquery per date. ``None`` as a date means the current price,
+    which is read from the materialized LatestStockPrice row. Past dates
+    held by the price cache at the stock's current version are not queried
+    again.
+    """
+    CURRENT = None
+
+    def __init__(self, stocks, dates=()):
+        self.stocks = stocks
+        self.dates = list(dict.fromkeys([self.CURRENT, *dates]))
+        self._prices = None
+        self._units = {}
+
+    @classmethod
+    def for_portfolio(cls, portfolio, dates=()):
+        return cls(Stock.objects.filter(holding__portfolio=portfolio), dates)
+
+    @classmethod
+    def for_portfolios(cls, portfolios, dates=()):
+        return cls(Stock.objects.filter(holding__portfolio__in=portfolios), dates)
+
+    @classmethod
+    def for_holdings(cls, holdings, dates=()):
+        return cls([holding.stock_id for holding in holdings], dates)
+
+    @staticmethod
+    def _price_expression(as_of):
+        if as_of is None:
+            return F('latest_price__price')
+        prices = StockPrice.objects.filter(stock=OuterRef('pk'), date__lte=as_of)
+        return Subquery(prices.order_by('-date').values('price')[:1])
+
+    def get_queryset(self, stocks, dates=None):
+        dates = self.dates if dates is None else dates
+        annotations = {
+            f'price_{index}': self._price_expression(as_of)
+            for index, as_of in enumerate(dates)
+        }
+        return (
+            Stock.objects.filter(pk__in=stocks)
+            .annotate(version=F('latest_price__updated_at'), **annotations)
+            .values('pk', 'version', *annotations)
+        )
+
+    @staticmethod
+    def _collect(row, dates, prices, versions):
+        versions[row['pk']] = row['version']
+        for index, as_of in enumerate(dates):
+            prices[(row['pk'], as_of)] = row[f'price_{index}']
+
+    def _fetch(self, stocks, dates=None):
+        dates = self.dates if dates is None else dates
+        prices, versions = {}, {}
+        for row in self.get_queryset(stocks, dates):
+            self._collect(row, dates, prices, versions)
+        return prices, versions
+
+    async def _afetch(self, stocks, dates=None):
+        dates = self.dates if dates is None else dates
+        prices, versions = {}, {}
+        async for row in self.get_queryset(stocks, dates).aiterator():
+            self._collect(row, dates, prices, versions)
+        return prices, versions
+
+    def _stock_ids(self):
+        if isinstance(self.stocks, QuerySet):
+            return list(self.stocks.values_list('pk', flat=True).distinct())
+        return list(dict.fromkeys(self.stocks))
+
+    async def _astock_ids(self):
+        if isinstance(self.stocks, QuerySet):
+            return [pk async for pk in self.stocks.values_list('pk', flat=True).distinct()]
+        return list(dict.fromkeys(self.stocks))
+
+    def _cacheable_dates(self, cache):
+        if not cache.enabled:
+            return []
+        return [as_of for as_of in self.dates if cache.is_cacheable(as_of)]
+
+    @staticmethod
+    def _from_cache(cache, stock_ids, dates):
+        """
+        Cached (version, price) entries, the stocks having all of them and
+        the other stocks.
+        """
+        entries = cache.get_many([
+            (stock_id, as_of) for stock_id in stock_ids for as_of in dates
+        ])
+        complete, missing = [], []
+        for stock_id in stock_ids:
+            if all((stock_id, as_of) in entries for as_of in dates):
+                complete.append(stock_id)
+            else:
+                missing.append(stock_id)
+        return entries, complete, missing
+
+    @staticmethod
+    def _use_cached(entries, complete, dates, prices, versions):
+        """
+        Adds the cached prices of stocks whose version still matches to
+        ``prices``; returns the other stocks.
+        """
+        stale = []
+        for stock_id in complete:
+            version = versions.get(stock_id)
+            if version is None or any(entries[(stock_id, as_of)][0] != version for as_of in dates):
+                stale.append(stock_id)
+                continue
+            for as_of in dates:
+                prices[(stock_id, as_of)] = entries[(stock_id, as_of)][1]
+        return stale
+
+    @staticmethod
+    def _entries(prices, versions, stock_ids, dates):
+        return {
+            (stock_id, as_of): (versions[stock_id], prices[(stock_id, as_of)])
+            for stock_id in stock_ids
+            for as_of in dates
+            if versions.get(stock_id) is not None and prices.get((stock_id, as_of)) is not None
+        }
+
+    def resolve(self):
+        """
+        Current prices and dates the cache does not hold are always read
+        from the database, together with each stock's LatestStockPrice
+        ``updated_at``. Cached entries are used only when they were stored
+        at that same version, so a price written by any process is seen.
+        """
+        if self._prices is None:
+            cache = get_price_cache()
+            cacheable = self._cacheable_dates(cache)
+            if not cacheable:
+                self._prices, _ = self._fetch(self.stocks)
+                return self._prices
+
+            stock_ids = self._stock_ids()
+            entries, complete, missing = self._from_cache(cache, stock_ids, cacheable)
+            prices, versions = {}, {}
+            if complete:
+                uncached = [as_of for as_of in self.dates if as_of not in cacheable]
+                prices, versions = self._fetch(complete, uncached)
+                missing += self._use_cached(entries, complete, cacheable, prices, versions)
+            if missing:
+                fetched, fetched_versions = self._fetch(missing)
+                cache.set_many(self._entries(fetched, fetched_versions, missing, cacheable))
+                prices.update(fetched)
+            self._prices = prices
+        return self._prices
+
+    async def aresolve(self):
+        """
+        ``resolve`` for async views: the queries run through the async ORM.
+        Shared cache tier calls are blocking, so they go to a thread.
+        """
+        if self._prices is None:
+            cache = get_price_cache()
+            cacheable = self._cacheable_dates(cache)
+            if not cacheable:
+                self._prices, _ = await self._afetch(self.stocks)
+                return self._prices
+
+            stock_ids = await self._astock_ids()
+            if cache.shared is None:
+                entries, complete, missing = self._from_cache(cache, stock_ids, cacheable)
+            else:
+                entries, complete, missing = await sync_to_async(self._from_cache)(
+                    cache, stock_ids, cacheable
+                )
+            prices, versions = {}, {}
+            if complete:
+                uncached = [as_of for as_of in self.dates if as_of not in cacheable]
+                prices, versions = await self._afetch(complete, uncached)
+                missing += self._use_cached(entries, complete, cacheable, prices, versions)
+            if missing:
+                fetched, fetched_versions = await self._afetch(missing)
+                values = self._entries(fetched, fetched_versions, missing, cacheable)
+                if cache.shared is None:
+                    cache.set_many(values)
+                else:
+                    await sync_to_async(cache.set_many)(values)
+                prices.update(fetched)
+            self._prices = prices
+        return self._prices
+
+    def get_price(self, stock_id, as_of=CURRENT):
+        if as_of not in self.dates:
+            raise KeyError(f"Date {as_of} was not requested from this resolver")
+        return self.resolve().get((stock_id, as_of))
+
+    def get_units(self, stock_id, as_of=CURRENT):
+        """``get_price`` as fixed-point units, converted once per price."""
+        key = (stock_id, as_of)
+        if key not in self._units:
+            price = self.get_price(stock_id, as_of)
+            self._units[key] = None if price is None else price_units(price)
+        return self._units[key]
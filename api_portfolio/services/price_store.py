@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+from datetime import date, timedelta
+import numpy as np
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from api_portfolio.models import LatestStockPrice, StockPrice
+from api_portfolio.utils.constants import (
+    MAX_LENGTH_PRICE_DECIMAL_PLACES,
+    PRICE_STORE_DATE_DTYPE,
+    PRICE_STORE_FORMAT,
+    PRICE_STORE_MANIFEST,
+    PRICE_STORE_PRICE_DTYPE,
+    PRICE_STORE_SAVE_EVERY,
+)
+
+EPOCH = date(1970, 1, 1)
+
+
+class ColumnarPriceStore:
+    """
+    Read-only copy of StockPrice as two fixed-width files per stock: dates
+    as int32 days since 1970-01-01 and prices as int64 in units of
+    1 / PRICE_SCALE, both sorted by date, read through ``numpy.memmap``.
+
+    ``manifest.json`` records each stock's row count, last date, a SHA-256
+    digest of the exported (date, price) rows and the LatestStockPrice
+    ``updated_at`` it was exported at. Every price write refreshes that
+    timestamp, so a stock whose timestamp moved is stale and readers fall
+    back to the database for it. ``export`` appends rows after the last
+    exported date when the rows up to it still match the digest, and
+    rewrites the stock otherwise.
+    """
+    PRICE_SCALE = 10 ** MAX_LENGTH_PRICE_DECIMAL_PLACES
+
+    def __init__(self, path=None):
+        self.path = path
+        self._manifest = None
+        self._manifest_mtime = None
+
+    @classmethod
+    def from_settings(cls):
+        return cls(getattr(settings, 'PRICE_STORE', {}).get('PATH'))
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def _file(self, stock_id, column):
+        return os.path.join(self.path, f'{stock_id}.{column}')
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.path, PRICE_STORE_MANIFEST)
+
+    def manifest(self):
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return {'format': PRICE_STORE_FORMAT, 'stocks': {}}
+        if mtime != self._manifest_mtime:
+            with open(self.manifest_path) as manifest:
+                self._manifest = json.load(manifest)
+            self._manifest_mtime = mtime
+        return self._manifest
+
+    def _save_manifest(self, manifest):
+        temporary = f'{self.manifest_path}.tmp'
+        with open(temporary, 'w') as output:
+            json.dump(manifest, output)
+        os.replace(temporary, self.manifest_path)
+
+    def fresh_stock_ids(self, stock_ids):
+        """Stocks whose stored series still match the database."""
+        stocks = self.manifest()['stocks'] if self.enabled else {}
+        if not stocks:
+            return set()
+        versions = LatestStockPrice.objects.filter(stock_id__in=stock_ids).values_list(
+            'stock_id', 'updated_at'
+        )
+        return {
+            stock_id for stock_id, updated_at in versions
+            if str(stock_id) in stocks
+            and stocks[str(stock_id)]['updated_at'] == updated_at.isoformat()
+        }
+
+    def series(self, stock_id):
+        """(days, scaled prices) memory-mapped arrays, or None."""
+        entry = self.manifest()['stocks'].get(str(stock_id))
+        if not entry or not entry['rows']:
+            return None
+        shape = (entry['rows'],)
+        return (
+            np.memmap(self._file(stock_id, 'dates'), dtype=PRICE_STORE_DATE_DTYPE, mode='r', shape=shape),
+            np.memmap(self._file(stock_id, 'prices'), dtype=PRICE_STORE_PRICE_DTYPE, mode='r', shape=shape),
+        )
+
+    @classmethod
+    def window(cls, series, start_date, end_date):
+        """
+        Price on or before ``start_date`` (or None) and the (day offset,
+        price) arrays after it up to ``end_date``, as float64.
+        """
+        days, prices = series
+        start = (start_date - EPOCH).days
+        first = np.searchsorted(days, start, side='right')
+        last = np.searchsorted(days, (end_date - EPOCH).days, side='right')
+        opening = prices[first - 1] / cls.PRICE_SCALE if first else None
+        return opening, days[first:last] - start, prices[first:last] / cls.PRICE_SCALE
+
+    @staticmethod
+    def _digest(days, prices):
+        digest = hashlib.sha256(days.tobytes())
+        digest.update(prices.tobytes())
+        return digest.hexdigest()
+
+    def _rows(self, stock_id):
+        prices = StockPrice.objects.filter(stock_id=stock_id).order_by('date')
+        rows = list(prices.values_list('date', 'price'))
+        return (
+            np.array([(day - EPOCH).days for day, _ in rows], dtype=PRICE_STORE_DATE_DTYPE),
+            np.array(
+                [int(price.scaleb(MAX_LENGTH_PRICE_DECIMAL_PLACES)) for _, price in rows],
+                dtype=PRICE_STORE_PRICE_DTYPE
+            ),
+        )
+
+    def _write(self, stock_id, days, prices):
+        for column, values in (('dates', days), ('prices', prices)):
+            temporary = f'{self._file(stock_id, column)}.tmp'
+            values.tofile(temporary)
+            os.replace(temporary, self._file(stock_id, column))
+
+    def _append(self, stock_id, rows, days, prices):
+        for column, values in (('dates', days), ('prices', prices)):
+            with open(self._file(stock_id, column), 'r+b') as output:
+                # Drop anything past the manifest left by an interrupted run.
+                output.truncate(rows * values.itemsize)
+                output.seek(0, os.SEEK_END)
+                values.tofile(output)
+
+    @classmethod
+    def _entry(cls, days, prices, version):
+        return {
+            'rows': len(days),
+            'last_date': (EPOCH + timedelta(days=int(days[-1]))).isoformat() if len(days) else None,
+            'digest': cls._digest(days, prices),
+            'updated_at': version,
+        }
+
+    def export(self, rebuild=False):
+        """
+        Brings the store up to date with StockPrice. Returns counts of
+        stocks written, appended, unchanged and removed, and rows written.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        manifest = self.manifest()
+        if rebuild or manifest.get('format') != PRICE_STORE_FORMAT:
+            manifest = {'format': PRICE_STORE_FORMAT, 'stocks': {}}
+        stocks = dict(manifest['stocks'])
+        stats = {'written': 0, 'appended': 0, 'unchanged': 0, 'removed': 0, 'rows': 0}
+
+        # Versions are read before any rows, so a write made during the
+        # export leaves the stock stale rather than silently missing.
+        versions = {
+            str(stock_id): updated_at.isoformat()
+            for stock_id, updated_at in LatestStockPrice.objects.values_list('stock_id', 'updated_at')
+        }
+        for stock_id in set(stocks) - set(versions):
+            del stocks[stock_id]
+            for column in ('dates', 'prices'):
+                if os.path.exists(self._file(stock_id, column)):
+                    os.remove(self._file(stock_id, column))
+            stats['removed'] += 1
+
+        for index, (stock_id, version) in enumerate(versions.items(), start=1):
+            entry = stocks.get(stock_id)
+            if entry and entry['updated_at'] == version:
+                stats['unchanged'] += 1
+                continue
+
+            days, prices = self._rows(stock_id)
+            rows = entry['rows'] if entry else 0
+            # Rows are sorted by unique date, so a matching prefix means
+            # nothing up to the last exported date changed.
+            if entry and self._digest(days[:rows], prices[:rows]) == entry['digest']:
+                self._append(stock_id, rows, days[rows:], prices[rows:])
+                stats['appended'] += 1
+                stats['rows'] += len(days) - rows
+            else:
+                self._write(stock_id, days, prices)
+                stats['written'] += 1
+                stats['rows'] += len(days)
+            stocks[stock_id] = self._entry(days, prices, version)
+
+            if index % PRICE_STORE_SAVE_EVERY == 0:
+                self._save_manifest({'format': PRICE_STORE_FORMAT, 'stocks': stocks})
+
+        self._save_manifest({'format': PRICE_STORE_FORMAT, 'stocks': stocks})
+        return stats
+
+
+_price_store = None
+
+
+def get_price_store():
+    global _price_store
+    if _price_store is None:
+        _price_store = ColumnarPriceStore.from_settings()
+    return _price_store
+
+
+@receiver(setting_changed)
+def reset_price_store(setting, **kwargs):
+    global _price_store
+    if setting == 'PRICE_STORE':
+        _price_store = None
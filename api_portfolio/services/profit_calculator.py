@@ -5,62 +5,80 @@ from api_portfolio.utils.constants import (
     ZERO_INVESTMENT,
     ZERO_YEARS
     )
-from api_portfolio.models import StockPrice
+from api_portfolio.utils.fixed_point import quantity_units, to_value
+from api_portfolio.services.portfolio_snapshot_service import PortfolioSnapshotService
+from api_portfolio.services.price_resolver import PriceResolver
 
 class ProfitCalculator:
     @staticmethod
-    def calculate_profit(queryset, start_date, end_date, quantity=1):
-        try:
-            start_price = queryset.filter(date__lte=start_date).latest('date').price
-            end_price = queryset.filter(date__lte=end_date).latest('date').price
-            return (Decimal(end_price) - Decimal(start_price)) * Decimal(quantity)
-        except StockPrice.DoesNotExist:
+    def holding_profit_units(holding, start_date, end_date, prices, quantity=None):
+        """
+        ``holding_profit`` in fixed-point value units (see utils.fixed_point).
+        """
+        start_price = prices.get_units(holding.stock_id, start_date)
+        end_price = prices.get_units(holding.stock_id, end_date)
+        if start_price is None or end_price is None:
             return None
+        if quantity is None:
+            quantity = quantity_units(holding.quantity)
+        return (end_price - start_price) * quantity
+
+    @classmethod
+    def holding_profit(cls, holding, start_date, end_date, prices):
+        profit = cls.holding_profit_units(holding, start_date, end_date, prices)
+        return None if profit is None else to_value(profit)
 
     @classmethod
-    def portfolio_profit(cls, portfolio, start_date, end_date):
-        total = Decimal('0')
+    def portfolio_profit(cls, portfolio, start_date, end_date, prices=None):
+        if prices is None:
+            snapshot = PortfolioSnapshotService.range_values(portfolio, start_date, end_date)
+            if snapshot is not None:
+                start_value, end_value = snapshot
+                return end_value - start_value
+            prices = PriceResolver.for_portfolio(portfolio, [start_date, end_date])
+        total = 0
         for holding in portfolio.holdings.all():
-            profit = cls.calculate_profit(
-                holding.stock.prices,
-                start_date,
-                end_date,
-                holding.quantity
-            )
+            profit = cls.holding_profit_units(holding, start_date, end_date, prices)
             if profit is not None:
                 total += profit
-        return total
-    
+        return to_value(total)
+
     @classmethod
-    def _get_initial_investment(cls, portfolio, start_date):
-        total = Decimal('0')
+    def _get_initial_investment(cls, portfolio, start_date, prices):
+        total = 0
         for holding in portfolio.holdings.all():
-            try:
-                price = holding.stock.prices.filter(
-                    date__lte=start_date
-                ).latest('date').price
-                total += Decimal(price) * Decimal(holding.quantity)
-            except StockPrice.DoesNotExist:
+            price = prices.get_units(holding.stock_id, start_date)
+            if price is None:
                 continue
-        return total
+            total += price * quantity_units(holding.quantity)
+        return to_value(total)
 
     @classmethod
-    def annualized_return(cls, portfolio, start_date, end_date):
-        total_profit = cls.portfolio_profit(portfolio, start_date, end_date)
-        initial_investment = cls._get_initial_investment(portfolio, start_date)
+    def annualized_return(cls, portfolio, start_date, end_date, prices=None):
+        if prices is None:
+            snapshot = PortfolioSnapshotService.range_values(portfolio, start_date, end_date)
+            if snapshot is not None:
+                start_value, end_value = snapshot
+                return cls.annualize(end_value - start_value, start_value, start_date, end_date)
+            prices = PriceResolver.for_portfolio(portfolio, [start_date, end_date])
+        total_profit = cls.portfolio_profit(portfolio, start_date, end_date, prices)
+        initial_investment = cls._get_initial_investment(portfolio, start_date, prices)
+        return cls.annualize(total_profit, initial_investment, start_date, end_date)
 
+    @staticmethod
+    def annualize(total_profit, initial_investment, start_date, end_date):
         if initial_investment == ZERO_INVESTMENT:
             return ZERO_ANNUALIZED_RETURN
 
         try:
             years = (end_date - start_date).days / YEAR_DAYS
-            
+
             if years <= ZERO_YEARS:
                 return ZERO_ANNUALIZED_RETURN
-            
+
             initial_investment = Decimal(str(initial_investment))
             years = Decimal(str(years))
-        
+
             return float((1 + (total_profit / initial_investment)) ** (1 / years) - 1)
         except (ValueError, TypeError):
             return ZERO_ANNUALIZED_RETURN
@@ -1,9 +1,20 @@
 from api_portfolio.models import Stock, StockPrice
+from api_portfolio.services.price_resolver import PriceResolver
 
 class StockService:
     @staticmethod
-    def get_current_price(stock):
-        return stock.prices.latest('date').price
+    def get_current_price(stock, prices=None):
+        if prices is not None:
+            return prices.get_price(stock.pk)
+        return stock.latest_price.price
+
+    @staticmethod
+    def get_current_prices(stocks):
+        prices = PriceResolver(stocks)
+        return {
+            stock_id: price
+            for (stock_id, _), price in prices.resolve().items()
+        }
 
     @staticmethod
     def get_or_create_stock(symbol, defaults=None):
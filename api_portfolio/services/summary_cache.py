@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from api_portfolio.utils.constants import SUMMARY_CACHE_DEFAULT_TIMEOUT, SUMMARY_CACHE_KEY_PREFIX
+
+
+class SummaryCache:
+    """
+    Serialized portfolio summaries keyed by portfolio, the normalized date
+    range and the validators of PortfolioService.with_validators, in a
+    Django cache backend.
+
+    Holding changes touch ``updated_at`` and price writes move
+    ``prices_updated_at``; both are read from the database on every
+    request, so a write from any process moves the portfolio's summaries
+    to new keys and old entries simply expire. This holds even with a
+    process-local backend, though each process then warms its own copy.
+    """
+    def __init__(self, cache_alias=None, timeout=SUMMARY_CACHE_DEFAULT_TIMEOUT):
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+
+    @classmethod
+    def from_settings(cls):
+        options = getattr(settings, 'SUMMARY_CACHE', {})
+        return cls(
+            cache_alias=options.get('CACHE_ALIAS'),
+            timeout=options.get('TIMEOUT', SUMMARY_CACHE_DEFAULT_TIMEOUT),
+        )
+
+    @property
+    def enabled(self):
+        return self.cache_alias is not None
+
+    @property
+    def backend(self):
+        return caches[self.cache_alias]
+
+    @staticmethod
+    def make_key(portfolio, start_date, end_date):
+        """``portfolio`` must be annotated by PortfolioService.with_validators."""
+        versions = [
+            value.isoformat() if value else ''
+            for value in (portfolio.updated_at, portfolio.prices_updated_at)
+        ]
+        date_range = [date.isoformat() if date else '' for date in (start_date, end_date)]
+        return (
+            f'{SUMMARY_CACHE_KEY_PREFIX}:{portfolio.pk}:'
+            f'{":".join(versions)}:{":".join(date_range)}'
+        )
+
+    def get(self, portfolio, start_date, end_date):
+        if not self.enabled:
+            return None
+        return self.backend.get(self.make_key(portfolio, start_date, end_date))
+
+    def set(self, portfolio, start_date, end_date, data):
+        if not self.enabled:
+            return
+        self.backend.set(
+            self.make_key(portfolio, start_date, end_date), data, timeout=self.timeout
+        )
+
+
+_summary_cache = None
+
+
+def get_summary_cache():
+    global _summary_cache
+    if _summary_cache is None:
+        _summary_cache = SummaryCache.from_settings()
+    return _summary_cache
+
+
+@receiver(setting_changed)
+def reset_summary_cache(setting, **kwargs):
+    global _summary_cache
+    if setting in ('SUMMARY_CACHE', 'CACHES'):
+        _summary_cache = None
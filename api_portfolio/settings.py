@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,6 +43,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api_portfolio.middleware.RequestProfilingMiddleware',
+    'api_portfolio.middleware.ReadYourWritesMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -74,13 +77,79 @@ WSGI_APPLICATION = 'api_portfolio.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
-
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE picks sqlite (default) or postgresql. DB_PROFILE=tuned keeps
+# connections open between requests with health checks and, on SQLite,
+# switches to WAL with a larger page cache and memory-mapped reads.
+
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+DB_TUNED = os.environ.get('DB_PROFILE', 'default') == 'tuned'
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 600 if DB_TUNED else 0))
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'api_portfolio'),
+            'USER': os.environ.get('DB_USER', ''),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', ''),
+            'PORT': os.environ.get('DB_PORT', ''),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_TUNED,
+            # PgBouncer in transaction pooling mode cannot keep the
+            # server-side cursors of QuerySet.iterator() open
+            'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('DB_PGBOUNCER') == '1',
+            'OPTIONS': {
+                'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', 5)),
+            },
+        }
     }
-}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_TUNED,
+        }
+    }
+    if DB_TUNED:
+        DATABASES['default']['OPTIONS'] = {
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                f"PRAGMA mmap_size={int(os.environ.get('DB_SQLITE_MMAP_SIZE', 256 * 1024 * 1024))};"
+                f"PRAGMA cache_size={int(os.environ.get('DB_SQLITE_CACHE_SIZE', -64000))};"
+            ),
+            # Writers take the lock at BEGIN and wait up to the timeout,
+            # instead of failing when a read transaction tries to upgrade
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': int(os.environ.get('DB_SQLITE_TIMEOUT', 20)),
+        }
+
+
+# Read replica
+# DB_REPLICA_NAME (a database name, or a file on SQLite) and/or
+# DB_REPLICA_HOST / DB_REPLICA_PORT add a replica with the primary's other
+# settings. Price history, summaries, portfolio lists and analytics read
+# from it; a client that wrote reads from the primary for the next
+# REPLICA_MAX_LAG seconds.
+
+REPLICA_DATABASE = None
+REPLICA_MAX_LAG = int(os.environ.get('DB_REPLICA_MAX_LAG', 5))
+
+if any(os.environ.get(f'DB_REPLICA_{key}') for key in ('NAME', 'HOST', 'PORT')):
+    REPLICA_DATABASE = 'replica'
+    DATABASES[REPLICA_DATABASE] = {
+        **DATABASES['default'],
+        'OPTIONS': dict(DATABASES['default'].get('OPTIONS', {})),
+        'TEST': {'MIRROR': 'default'},
+    }
+    for key in ('NAME', 'HOST', 'PORT'):
+        if os.environ.get(f'DB_REPLICA_{key}'):
+            DATABASES[REPLICA_DATABASE][key] = os.environ[f'DB_REPLICA_{key}']
+
+DATABASE_ROUTERS = ['api_portfolio.db_router.ReplicaRouter']
 
 
 # Password validation
@@ -123,3 +192,59 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Price cache
+# In-process LRU of resolved prices, optionally backed by a shared cache alias
+
+PRICE_CACHE = {
+    'MAX_SIZE': 10000,
+    'CACHE_ALIAS': None,
+}
+
+
+# Columnar price store
+# Directory of memory-mapped per-stock price arrays read by the analytics
+# (None disables it); fill it with the export_price_store command
+
+PRICE_STORE = {
+    'PATH': None,
+}
+
+
+# Summary cache
+# Serialized portfolio summaries in a cache alias (None disables it); keys
+# move on every holding or price write, so a process-local backend is safe
+
+SUMMARY_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 60 * 60,
+}
+
+
+# Request profiling
+# Query count, DB time, duplicate queries and serializer time of a sample of
+# requests, sent as Server-Timing headers and JSON lines on the
+# api_portfolio.profiling logger
+
+REQUEST_PROFILING = {
+    'ENABLED': False,
+    'SAMPLE_RATE': 1.0,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api_portfolio.profiling': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
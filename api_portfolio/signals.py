@@ -0,0 +1,53 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from api_portfolio.models import Holding, StockPrice
+from api_portfolio.services.latest_price_service import LatestPriceService
+from api_portfolio.services.portfolio_service import PortfolioService
+from api_portfolio.services.portfolio_snapshot_service import PortfolioSnapshotService
+from api_portfolio.services.price_cache import get_price_cache
+
+# Sent with ``stock_dates``: {stock_id: earliest date written} whenever
+# StockPrice rows change, including bulk writes that skip model signals.
+prices_written = Signal()
+
+
+def notify_prices_written(stock_dates):
+    if stock_dates:
+        prices_written.send(sender=StockPrice, stock_dates=stock_dates)
+
+
+@receiver(post_save, sender=StockPrice)
+@receiver(post_delete, sender=StockPrice)
+def stock_price_changed(sender, instance, **kwargs):
+    # Deletes send post_delete inside the deleting transaction; saves are
+    # wrapped in one by StockPrice.save.
+    notify_prices_written({instance.stock_id: instance.date})
+
+
+@receiver(prices_written)
+def refresh_latest_prices(sender, stock_dates, **kwargs):
+    LatestPriceService.refresh(stock_dates.keys())
+
+
+@receiver(prices_written)
+def invalidate_price_cache(sender, stock_dates, **kwargs):
+    # Cached entries are checked against the stock's version anyway; this
+    # only frees the local tier, once the new version is visible.
+    def invalidate():
+        price_cache = get_price_cache()
+        for stock_id, from_date in stock_dates.items():
+            price_cache.invalidate(stock_id, from_date)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(prices_written)
+def invalidate_portfolio_snapshots(sender, stock_dates, **kwargs):
+    PortfolioSnapshotService.invalidate(stock_dates)
+
+
+@receiver(post_save, sender=Holding)
+@receiver(post_delete, sender=Holding)
+def holding_changed(sender, instance, **kwargs):
+    PortfolioService.touch([instance.portfolio_id])
@@ -0,0 +1,63 @@
+from datetime import date
+from decimal import Decimal
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from api_portfolio.models import Holding, Portfolio, Stock, StockPrice
+from api_portfolio.services.price_cache import get_price_cache
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        get_price_cache().clear()
+        caches['default'].clear()
+        stock = Stock.objects.create(symbol='S1', name='Stock 1')
+        for day, price in ((1, '10.00'), (2, '11.50'), (3, '12.25')):
+            StockPrice.objects.create(stock=stock, date=date(2024, 3, day), price=Decimal(price))
+        portfolio = Portfolio.objects.create(name='p')
+        Holding.objects.create(
+            portfolio=portfolio, stock=stock, quantity=Decimal('2.00'), purchase_date=date(2024, 3, 1)
+        )
+
+    def assertSameResponse(self, sync_name, async_name, args, params=None):
+        expected = self.client.get(reverse(sync_name, args=args), params)
+        response = self.client.get(reverse(async_name, args=args), params)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.json(), expected.json())
+        self.assertEqual(response.get('ETag'), expected.get('ETag'))
+        return response
+
+    def test_matches_sync_views(self):
+        self.assertSameResponse('stock-list', 'async-stock-list', [])
+        self.assertSameResponse('stock-prices', 'async-stock-prices', ['s1'], {'start_date': '2024-03-02'})
+        self.assertSameResponse(
+            'portfolio-summary', 'async-portfolio-summary', ['p'],
+            {'start_date': '2024-03-01', 'end_date': '2024-03-03'}
+        )
+
+    def test_errors(self):
+        self.assertSameResponse('stock-prices', 'async-stock-prices', ['NOPE'])
+        self.assertSameResponse('portfolio-summary', 'async-portfolio-summary', ['nope'])
+        response = self.assertSameResponse(
+            'stock-prices', 'async-stock-prices', ['S1'], {'start_date': 'yesterday'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_not_modified(self):
+        for url in (
+            reverse('async-stock-prices', args=['S1']),
+            reverse('async-portfolio-summary', args=['p']),
+        ):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+
+    async def test_ndjson_export(self):
+        response = await self.async_client.get(
+            reverse('async-stock-prices', args=['S1']), {'format': 'ndjson'}
+        )
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        lines = [line async for line in response.streaming_content]
+        self.assertEqual(b''.join(lines).decode().splitlines()[0], '{"date": "2024-03-03", "price": "12.25"}')
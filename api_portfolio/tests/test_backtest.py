@@ -0,0 +1,82 @@
+import csv
+import os
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from api_portfolio.models import Holding, Portfolio, Stock, StockPrice
+from api_portfolio.services.backtest_service import BacktestService
+from api_portfolio.services.profit_calculator import ProfitCalculator
+from api_portfolio.utils.constants import BACKTEST_FIELDS
+
+START = date(2024, 1, 1)
+
+
+class BacktestTests(TestCase):
+    def setUp(self):
+        stocks = [Stock.objects.create(symbol=f'S{index}', name=f'Stock {index}') for index in (1, 2)]
+        for stock, prices in zip(stocks, (('10.00', '12.00', '11.00'), ('5.00', '4.50', '6.00'))):
+            StockPrice.objects.bulk_create([
+                StockPrice(stock=stock, date=START + timedelta(days=30 * index), price=Decimal(price))
+                for index, price in enumerate(prices)
+            ])
+        for name, positions in (('a', [(stocks[0], '2.00')]), ('b', [(stocks[0], '1.50'), (stocks[1], '3.00')])):
+            portfolio = Portfolio.objects.create(name=name)
+            for stock, quantity in positions:
+                Holding.objects.create(
+                    portfolio=portfolio, stock=stock, quantity=Decimal(quantity), purchase_date=START
+                )
+        Portfolio.objects.create(name='empty')
+
+    def test_matches_profit_calculator(self):
+        output = StringIO()
+        progress = []
+        result = BacktestService(
+            Portfolio.objects.all(), START, START + timedelta(days=60), window_days=30, step_days=15,
+            workers=2, chunk_size=1
+        ).run(output, lambda done, total: progress.append((done, total)))
+        self.assertEqual(result, {'portfolios': 3, 'windows': 3, 'rows': 9})
+        self.assertEqual(progress, [(1, 3), (2, 3), (3, 3)])
+
+        output.seek(0)
+        header, *rows = csv.reader(output)
+        self.assertEqual(tuple(header), BACKTEST_FIELDS)
+        # Chunks are written as they complete, in any order.
+        rows.sort()
+        self.assertEqual(len(rows), 9)
+        for name, start, end, profit, initial, annualized in rows:
+            with self.subTest(portfolio=name, start=start):
+                portfolio = Portfolio.objects.get(name=name)
+                start, end = date.fromisoformat(start), date.fromisoformat(end)
+                self.assertEqual((end - start).days, 30)
+                self.assertAlmostEqual(
+                    float(profit), float(ProfitCalculator.portfolio_profit(portfolio, start, end)), places=4
+                )
+                self.assertAlmostEqual(
+                    float(annualized), float(ProfitCalculator.annualized_return(portfolio, start, end)), places=4
+                )
+        self.assertEqual(rows[:3], [
+            ['a', '2024-01-01', '2024-01-31', '4.0', '20.0', '8.205167'],
+            ['a', '2024-01-16', '2024-02-15', '4.0', '20.0', '8.205167'],
+            ['a', '2024-01-31', '2024-03-01', '-2.0', '24.0', '-0.653324'],
+        ])
+
+    def test_command(self):
+        descriptor, path = tempfile.mkstemp(suffix='.csv')
+        os.close(descriptor)
+        self.addCleanup(os.remove, path)
+        stdout = StringIO()
+        call_command(
+            'backtest', '--start=2024-01-01', '--end=2024-03-01', '--window-days=30', '--step-days=30',
+            '--portfolio=a', '--workers=1', f'--output={path}', stdout=stdout
+        )
+        self.assertIn('Wrote 2 rows (1 portfolios x 2 windows of 30 days)', stdout.getvalue())
+        with open(path, newline='') as output:
+            self.assertEqual(len(list(csv.reader(output))), 3)
+
+        with self.assertRaisesMessage(CommandError, 'Unknown portfolios: nope'):
+            call_command('backtest', portfolio=['nope'], stdout=StringIO())
+        with self.assertRaisesMessage(CommandError, 'shorter than one window'):
+            call_command('backtest', '--start=2024-01-01', '--end=2024-01-10', stdout=StringIO())
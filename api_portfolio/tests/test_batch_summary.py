@@ -0,0 +1,65 @@
+import json
+from datetime import date
+from decimal import Decimal
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from api_portfolio.models import Holding, Portfolio, Stock, StockPrice
+from api_portfolio.services.price_cache import get_price_cache
+
+START = date(2024, 3, 1)
+END = date(2024, 3, 5)
+
+
+class BatchSummaryTests(TestCase):
+    def setUp(self):
+        get_price_cache().clear()
+        caches['default'].clear()
+        self.url = reverse('portfolio-summary-batch')
+
+    def add_portfolio(self, index):
+        stock = Stock.objects.create(symbol=f'S{index}', name=f'Stock {index}')
+        StockPrice.objects.create(stock=stock, date=START, price=Decimal('10.00'))
+        StockPrice.objects.create(stock=stock, date=END, price=Decimal(10 + index))
+        portfolio = Portfolio.objects.create(name=f'p{index}')
+        Holding.objects.create(portfolio=portfolio, stock=stock, quantity=Decimal('2.00'), purchase_date=START)
+
+    def post(self, names, **dates):
+        return self.client.post(self.url, {'portfolios': names, **dates}, content_type='application/json')
+
+    def lines(self, names, **dates):
+        response = self.post(names, **dates)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    def test_request_order(self):
+        for index in (1, 2):
+            self.add_portfolio(index)
+        lines = self.lines(['p2', 'nope', 'p1', 'p2'], start_date=START.isoformat(), end_date=END.isoformat())
+        self.assertEqual([line['name'] for line in lines], ['p2', 'nope', 'p1', 'p2'])
+        self.assertEqual(lines[1], {'name': 'nope', 'detail': "No Portfolio matches the given query."})
+        self.assertEqual([lines[0]['total_profit'], lines[2]['total_profit']], [4.0, 2.0])
+        self.assertEqual(lines[3], lines[0])
+
+    def test_invalid_dates(self):
+        response = self.post(['p1'], start_date='2024-03-05', end_date='2024-03-01')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('end_date', response.json())
+        self.assertEqual(self.post([]).status_code, 400)
+
+    def test_queries_do_not_grow_with_portfolios(self):
+        counts = []
+        for total in (2, 6):
+            for index in range(total - 4 if counts else 0, total):
+                self.add_portfolio(index)
+            get_price_cache().clear()
+            with CaptureQueriesContext(connection) as queries:
+                lines = self.lines(
+                    [f'p{index}' for index in range(total)],
+                    start_date=START.isoformat(), end_date=END.isoformat()
+                )
+            self.assertEqual(len(lines), total)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
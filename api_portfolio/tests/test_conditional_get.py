@@ -0,0 +1,67 @@
+from datetime import date
+from decimal import Decimal
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from api_portfolio.models import Holding, Portfolio, Stock, StockPrice
+from api_portfolio.services.price_cache import get_price_cache
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        get_price_cache().clear()
+        caches['default'].clear()
+        self.stock = Stock.objects.create(symbol='S1', name='Stock 1')
+        for day, price in ((1, '10.00'), (2, '11.00')):
+            StockPrice.objects.create(stock=self.stock, date=date(2024, 3, day), price=Decimal(price))
+        self.portfolio = Portfolio.objects.create(name='p')
+        Holding.objects.create(
+            portfolio=self.portfolio, stock=self.stock, quantity=Decimal('2.00'),
+            purchase_date=date(2024, 3, 1)
+        )
+        self.summary_url = reverse('portfolio-summary', args=['p'])
+        self.prices_url = reverse('stock-prices', args=['S1'])
+
+    def assertNotModified(self, url, etag, **params):
+        with self.assertNumQueries(1):
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertIn('Last-Modified', response)
+
+    def assertModified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        return response
+
+    def test_summary(self):
+        etag = self.client.get(self.summary_url)['ETag']
+        self.assertNotModified(self.summary_url, etag)
+
+        # Rewriting a price in place moves neither the latest date nor id.
+        price = StockPrice.objects.get(stock=self.stock, date=date(2024, 3, 2))
+        price.price = Decimal('12.00')
+        price.save()
+        response = self.assertModified(self.summary_url, etag)
+        self.assertEqual(Decimal(response.json()['total_value']), Decimal('24.00'))
+
+        etag = response['ETag']
+        holding = Holding.objects.get(portfolio=self.portfolio)
+        holding.quantity = Decimal('3.00')
+        holding.save()
+        self.assertModified(self.summary_url, etag)
+
+    def test_prices(self):
+        etag = self.client.get(self.prices_url)['ETag']
+        self.assertNotModified(self.prices_url, etag)
+
+        StockPrice.objects.create(stock=self.stock, date=date(2024, 3, 3), price=Decimal('13.00'))
+        response = self.assertModified(self.prices_url, etag)
+        self.assertEqual(response.json()['results'][0]['date'], '2024-03-03')
+
+    def test_etag_depends_on_parameters(self):
+        etag = self.client.get(self.prices_url)['ETag']
+        response = self.client.get(self.prices_url, {'start_date': '2024-03-02'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotModified(self.prices_url, response['ETag'], start_date='2024-03-02')
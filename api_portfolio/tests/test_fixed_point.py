@@ -0,0 +1,162 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from django.test import TestCase
+from api_portfolio.models import Holding, Portfolio, Stock, StockPrice
+from api_portfolio.services.portfolio_service import PortfolioService
+from api_portfolio.services.portfolio_snapshot_service import PortfolioSnapshotService
+from api_portfolio.services.portfolio_valuation import PortfolioValuation
+from api_portfolio.services.price_cache import get_price_cache
+from api_portfolio.services.price_resolver import PriceResolver
+from api_portfolio.services.profit_calculator import ProfitCalculator
+from api_portfolio.signals import notify_prices_written
+from api_portfolio.utils.fixed_point import price_units, quantity_units, to_units
+
+TODAY = date(2025, 4, 25)
+RANGES = [
+    (TODAY - timedelta(days=150), TODAY - timedelta(days=3)),
+    (TODAY - timedelta(days=199), TODAY),
+    (TODAY - timedelta(days=40), TODAY - timedelta(days=40)),
+]
+
+
+def price_on(stock_id, day=None):
+    prices = StockPrice.objects.filter(stock_id=stock_id)
+    if day is not None:
+        prices = prices.filter(date__lte=day)
+    price = prices.order_by('-date').values_list('price', flat=True).first()
+    return None if price is None else Decimal(price)
+
+
+def decimal_valuation(portfolio, start_date, end_date):
+    """The Decimal loops the fixed-point valuation replaced, reading prices directly."""
+    total_value = Decimal('0')
+    total_profit = Decimal('0')
+    initial_investment = Decimal('0')
+    profits = {}
+    for holding in portfolio.holdings.all():
+        quantity = Decimal(holding.quantity)
+        current_price = price_on(holding.stock_id)
+        if current_price is not None:
+            total_value += current_price * quantity
+        start_price = price_on(holding.stock_id, start_date)
+        end_price = price_on(holding.stock_id, end_date)
+        profit = None
+        if start_price is not None and end_price is not None:
+            profit = (end_price - start_price) * quantity
+            total_profit += profit
+        profits[holding.pk] = profit
+        if start_price is not None:
+            initial_investment += start_price * quantity
+    annualized_return = ProfitCalculator.annualize(
+        total_profit, initial_investment, start_date, end_date
+    )
+    return total_value, total_profit, initial_investment, annualized_return, profits
+
+
+class FixedPointValuationTests(TestCase):
+    """Fixed-point sums equal the Decimal ones exactly, not approximately."""
+    def setUp(self):
+        get_price_cache().clear()
+        rng = random.Random(3)
+        stocks = [Stock.objects.create(symbol=f'S{index}', name=f'Stock {index}') for index in range(30)]
+        for stock in stocks:
+            StockPrice.objects.bulk_create([
+                StockPrice(
+                    stock=stock,
+                    date=TODAY - timedelta(days=day),
+                    price=Decimal(rng.randint(1, 10 ** 6)).scaleb(-2)
+                )
+                for day in range(rng.randint(0, 100), 200, rng.randint(1, 5))
+            ])
+        # Values of up to 18 significant digits, more than a float keeps.
+        large = Stock.objects.create(symbol='LARGE', name='Large')
+        StockPrice.objects.bulk_create([
+            StockPrice(
+                stock=large,
+                date=TODAY - timedelta(days=day),
+                price=Decimal(rng.randint(10 ** 9, 9 * 10 ** 9)).scaleb(-2)
+            )
+            for day in range(0, 200, 7)
+        ])
+        notify_prices_written({stock.pk: TODAY - timedelta(days=200) for stock in [*stocks, large]})
+        for index in range(20):
+            portfolio = Portfolio.objects.create(name=f'p{index}')
+            for stock in rng.sample(stocks, rng.randint(0, 15)):
+                Holding.objects.create(
+                    portfolio=portfolio,
+                    stock=stock,
+                    quantity=Decimal(rng.randint(1, 10 ** 6)).scaleb(-2),
+                    purchase_date=TODAY
+                )
+            if index % 5 == 0:
+                Holding.objects.create(
+                    portfolio=portfolio,
+                    stock=large,
+                    quantity=Decimal(rng.randint(10 ** 8, 9 * 10 ** 8)).scaleb(-2),
+                    purchase_date=TODAY
+                )
+
+    def portfolios(self):
+        return Portfolio.objects.prefetch_related('holdings').order_by('pk')
+
+    def test_resolved_prices(self):
+        for portfolio in self.portfolios():
+            for start_date, end_date in RANGES:
+                prices = PriceResolver.for_holdings(portfolio.holdings.all(), [start_date, end_date])
+                valuation = PortfolioValuation(portfolio, start_date, end_date, prices)
+                total_value, total_profit, initial_investment, annualized_return, profits = (
+                    decimal_valuation(portfolio, start_date, end_date)
+                )
+                self.assertEqual(
+                    (
+                        valuation.total_value,
+                        valuation.total_profit,
+                        valuation.initial_investment,
+                        valuation.annualized_return,
+                    ),
+                    (total_value, total_profit, initial_investment, annualized_return)
+                )
+                for holding in portfolio.holdings.all():
+                    self.assertEqual(valuation.get_profit(holding), profits[holding.pk])
+                self.assertEqual(
+                    ProfitCalculator.portfolio_profit(portfolio, start_date, end_date, prices),
+                    total_profit
+                )
+                self.assertEqual(
+                    ProfitCalculator.annualized_return(portfolio, start_date, end_date, prices),
+                    annualized_return
+                )
+                self.assertEqual(PortfolioService(portfolio).calculate_total_value(prices), total_value)
+
+    def test_snapshots(self):
+        PortfolioSnapshotService.refresh(until=TODAY)
+        from_snapshots = 0
+        significant_digits = 0
+        for portfolio in self.portfolios():
+            for start_date, end_date in RANGES:
+                _, total_profit, _, annualized_return, _ = decimal_valuation(portfolio, start_date, end_date)
+                values = PortfolioSnapshotService.range_values(portfolio, start_date, end_date)
+                if values:
+                    from_snapshots += 1
+                    significant_digits = max(
+                        significant_digits, *(len(value.as_tuple().digits) for value in values)
+                    )
+                self.assertEqual(
+                    ProfitCalculator.portfolio_profit(portfolio, start_date, end_date), total_profit
+                )
+                self.assertEqual(
+                    ProfitCalculator.annualized_return(portfolio, start_date, end_date),
+                    annualized_return
+                )
+        self.assertGreater(from_snapshots, 0)
+        self.assertGreater(significant_digits, 15)
+
+    def test_units(self):
+        self.assertEqual(price_units(Decimal('12.34')), 1234)
+        self.assertEqual(price_units(Decimal('12.3')), 1230)
+        self.assertEqual(price_units(Decimal('-0.01')), -1)
+        self.assertEqual(quantity_units(Decimal('99999999.99')), 9999999999)
+        self.assertEqual(to_units(Decimal('1.2345'), 4), 12345)
+        with self.assertRaises(ValueError):
+            price_units(Decimal('1.234'))
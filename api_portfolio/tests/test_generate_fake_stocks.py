@@ -0,0 +1,31 @@
+from io import StringIO
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from api_portfolio.models import Holding, Portfolio, StockPrice
+
+
+class GenerateFakeStocksTests(TestCase):
+    def generate(self, *args):
+        call_command(
+            'generate_fake_stocks', '--scale', '--stocks=5', '--days=9', '--seed=1',
+            '--prefix=T', *args, stdout=StringIO()
+        )
+
+    def test_scale(self):
+        self.generate('--portfolios=3', '--holdings-per-portfolio=2')
+        self.assertEqual(StockPrice.objects.count(), 50)
+        self.assertEqual(Holding.objects.count(), 6)
+
+    def test_portfolio_names_skip_deleted_ones(self):
+        self.generate('--portfolios=3')
+        Portfolio.objects.get(name='T-PF-1').delete()
+        self.generate('--portfolios=2')
+        self.assertEqual(
+            sorted(Portfolio.objects.values_list('name', flat=True)),
+            ['T-PF-0', 'T-PF-2', 'T-PF-3', 'T-PF-4']
+        )
+
+    def test_update_is_rejected_in_scale_mode(self):
+        with self.assertRaises(CommandError):
+            self.generate('--update')
+        self.assertFalse(StockPrice.objects.exists())
@@ -0,0 +1,29 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from api_portfolio.models import LatestStockPrice, Stock, StockPrice
+
+
+class LatestStockPriceTests(TestCase):
+    def setUp(self):
+        self.stock = Stock.objects.create(symbol='S1', name='Stock 1')
+        for day, price in ((1, '10.00'), (2, '11.00'), (3, '12.50')):
+            StockPrice.objects.create(stock=self.stock, date=date(2024, 3, day), price=Decimal(price))
+
+    def latest(self):
+        return LatestStockPrice.objects.filter(stock=self.stock).values_list('date', 'price').first()
+
+    def test_save_refreshes(self):
+        self.assertEqual(self.latest(), (date(2024, 3, 3), Decimal('12.50')))
+        StockPrice.objects.create(stock=self.stock, date=date(2024, 2, 1), price=Decimal('9.00'))
+        self.assertEqual(self.latest(), (date(2024, 3, 3), Decimal('12.50')))
+
+    def test_delete_refreshes(self):
+        StockPrice.objects.get(stock=self.stock, date=date(2024, 3, 3)).delete()
+        self.assertEqual(self.latest(), (date(2024, 3, 2), Decimal('11.00')))
+
+        StockPrice.objects.filter(stock=self.stock, date__gte=date(2024, 3, 2)).delete()
+        self.assertEqual(self.latest(), (date(2024, 3, 1), Decimal('10.00')))
+
+        self.stock.prices.all().delete()
+        self.assertIsNone(self.latest())
@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.test import TestCase
+from django.urls import reverse
+from api_portfolio.models import Stock, StockPrice
+
+START = date(2024, 1, 1)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        stock = Stock.objects.create(symbol='S1', name='Stock 1')
+        StockPrice.objects.bulk_create([
+            StockPrice(stock=stock, date=START + timedelta(days=day), price=Decimal(10 + day))
+            for day in range(25)
+        ])
+        self.url = reverse('stock-prices', args=['S1'])
+
+    @staticmethod
+    def dates(page):
+        return [row['date'] for row in page['results']]
+
+    def test_cursor(self):
+        expected = [(START + timedelta(days=day)).isoformat() for day in reversed(range(25))]
+        seen = []
+        url = f'{self.url}?page_size=10'
+        with self.assertNumQueries(2):
+            page = self.client.get(url).json()
+        self.assertNotIn('count', page)
+        self.assertIsNone(page['previous'])
+        while True:
+            seen += self.dates(page)
+            if page['next'] is None:
+                break
+            page = self.client.get(page['next']).json()
+        self.assertEqual(seen, expected)
+
+        previous = self.client.get(page['previous']).json()
+        self.assertEqual(self.dates(previous), expected[10:20])
+
+    def test_page_number_fallback(self):
+        page = self.client.get(self.url, {'page': 3, 'page_size': 10}).json()
+        self.assertEqual(page['count'], 25)
+        self.assertIsNone(page['next'])
+        self.assertIn('page=2', page['previous'])
+        self.assertEqual(
+            self.dates(page),
+            [(START + timedelta(days=day)).isoformat() for day in reversed(range(5))]
+        )
+
+        response = self.client.get(self.url, {'page': 4, 'page_size': 10})
+        self.assertEqual(response.status_code, 404)
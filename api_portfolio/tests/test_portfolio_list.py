@@ -0,0 +1,49 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from django.urls import reverse
+from api_portfolio.models import Holding, Portfolio, Stock, StockPrice
+from api_portfolio.services.price_cache import get_price_cache
+from api_portfolio.utils.constants import EXPAND_VALUATION
+
+
+class PortfolioListTests(TestCase):
+    def setUp(self):
+        get_price_cache().clear()
+        stock = Stock.objects.create(symbol='S1', name='Stock 1')
+        for day, price in ((1, '10.00'), (5, '12.00')):
+            StockPrice.objects.create(stock=stock, date=date(2024, 3, day), price=Decimal(price))
+        portfolio = Portfolio.objects.create(name='p')
+        Portfolio.objects.create(name='empty')
+        Holding.objects.create(
+            portfolio=portfolio, stock=stock, quantity=Decimal('2.50'), purchase_date=date(2024, 3, 1)
+        )
+        self.url = reverse('list-portfolio')
+
+    def test_default_fields(self):
+        with self.assertNumQueries(1):
+            results = self.client.get(self.url).json()['results']
+        self.assertEqual(
+            [
+                {key: value for key, value in portfolio.items() if key not in ('id', 'created_at')}
+                for portfolio in results
+            ],
+            [
+                {'name': 'p', 'holdings_count': 1, 'total_value': 30.0},
+                {'name': 'empty', 'holdings_count': 0, 'total_value': 0.0},
+            ]
+        )
+        self.assertEqual(set(results[0]), {'id', 'name', 'created_at', 'holdings_count', 'total_value'})
+
+    def test_expand_valuation(self):
+        results = self.client.get(self.url, {
+            'expand': EXPAND_VALUATION, 'start_date': '2024-03-01', 'end_date': '2024-03-05',
+        }).json()['results']
+        self.assertEqual(results[0]['total_value'], 30.0)
+        self.assertEqual(results[0]['total_profit'], 5.0)
+        self.assertEqual(
+            results[0]['stocks'],
+            [{'symbol': 'S1', 'name': 'Stock 1', 'quantity': '2.50', 'current_price': 12.0, 'profit': 5.0}]
+        )
+        self.assertEqual(results[1]['stocks'], [])
+        self.assertNotIn('holdings_count', results[0])
@@ -0,0 +1,35 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from api_portfolio.models import Holding, Portfolio, Stock, StockPrice
+from api_portfolio.services.portfolio_snapshot_service import PortfolioSnapshotService
+from api_portfolio.services.price_resolver import PriceResolver
+from api_portfolio.services.profit_calculator import ProfitCalculator
+
+START = date(2024, 3, 1)
+END = date(2024, 3, 8)
+
+
+class PortfolioSnapshotTests(TestCase):
+    def setUp(self):
+        stock = Stock.objects.create(symbol='S1', name='Stock 1')
+        StockPrice.objects.create(stock=stock, date=START, price=Decimal('98765.43'))
+        StockPrice.objects.create(stock=stock, date=END, price=Decimal('98766.47'))
+        self.portfolio = Portfolio.objects.create(name='p')
+        Holding.objects.create(
+            portfolio=self.portfolio, stock=stock, quantity=Decimal('1234567.89'), purchase_date=START
+        )
+
+    def test_large_values_match_the_raw_path(self):
+        prices = PriceResolver.for_portfolio(self.portfolio, [START, END])
+        raw_profit = ProfitCalculator.portfolio_profit(self.portfolio, START, END, prices)
+        raw_return = ProfitCalculator.annualized_return(self.portfolio, START, END, prices)
+        self.assertEqual(raw_profit, Decimal('1283950.6056'))
+
+        PortfolioSnapshotService.refresh(until=END)
+        self.assertEqual(
+            PortfolioSnapshotService.range_values(self.portfolio, START, END),
+            (Decimal('121932628520.0427'), Decimal('121933912470.6483'))
+        )
+        self.assertEqual(ProfitCalculator.portfolio_profit(self.portfolio, START, END), raw_profit)
+        self.assertEqual(ProfitCalculator.annualized_return(self.portfolio, START, END), raw_return)
@@ -0,0 +1,55 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.test import TestCase
+from django.utils import timezone
+from api_portfolio.models import Stock, StockPrice
+from api_portfolio.services.latest_price_service import LatestPriceService
+from api_portfolio.services.price_cache import get_price_cache
+from api_portfolio.services.price_resolver import PriceResolver
+
+START = date(2024, 3, 1)
+END = date(2024, 3, 20)
+
+
+class PriceCacheTests(TestCase):
+    def setUp(self):
+        get_price_cache().clear()
+        self.stock = Stock.objects.create(symbol='S1', name='Stock 1')
+        StockPrice.objects.create(stock=self.stock, date=START, price=Decimal('10.00'))
+        StockPrice.objects.create(stock=self.stock, date=END, price=Decimal('19.00'))
+
+    def resolve(self, queries):
+        resolver = PriceResolver([self.stock.pk], [START, END])
+        with self.assertNumQueries(queries):
+            resolver.resolve()
+        return [resolver.get_price(self.stock.pk, as_of) for as_of in (None, START, END)]
+
+    def write_elsewhere(self, day, price):
+        # A write made by another process: the row and LatestStockPrice
+        # change, but this process's cache is never invalidated.
+        StockPrice.objects.bulk_create(
+            [StockPrice(stock=self.stock, date=day, price=Decimal(price))],
+            update_conflicts=True,
+            unique_fields=['stock', 'date'],
+            update_fields=['price']
+        )
+        LatestPriceService.refresh([self.stock.pk])
+
+    def test_hits_read_only_current_prices(self):
+        self.assertEqual(self.resolve(1), [Decimal('19.00'), Decimal('10.00'), Decimal('19.00')])
+        self.assertEqual(self.resolve(1), [Decimal('19.00'), Decimal('10.00'), Decimal('19.00')])
+        self.assertEqual(get_price_cache().stats()['hits'], 2)
+
+    def test_writes_from_other_processes_are_seen(self):
+        self.resolve(1)
+        self.write_elsewhere(END, '99.00')
+        self.assertEqual(self.resolve(2), [Decimal('99.00'), Decimal('10.00'), Decimal('99.00')])
+
+        self.write_elsewhere(START, '5.00')
+        self.assertEqual(self.resolve(2), [Decimal('99.00'), Decimal('5.00'), Decimal('99.00')])
+        self.assertEqual(self.resolve(1), [Decimal('99.00'), Decimal('5.00'), Decimal('99.00')])
+
+    def test_today_and_missing_prices_are_not_cached(self):
+        resolver = PriceResolver([self.stock.pk], [START - timedelta(days=1), timezone.now().date()])
+        resolver.resolve()
+        self.assertEqual(get_price_cache().stats()['size'], 0)
@@ -0,0 +1,49 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from django.urls import reverse
+from api_portfolio.models import Stock, StockPrice
+
+
+class PriceExportTests(TestCase):
+    def setUp(self):
+        stock = Stock.objects.create(symbol='S1', name='Stock 1')
+        for day, price in ((1, '10.00'), (2, '11.50'), (3, '12.25')):
+            StockPrice.objects.create(stock=stock, date=date(2024, 3, day), price=Decimal(price))
+        self.url = reverse('stock-prices', args=['S1'])
+
+    @staticmethod
+    def body(response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        response = self.client.get(self.url, {'format': 'ndjson', 'start_date': '2024-03-02'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="S1_prices.ndjson"')
+        self.assertEqual(
+            self.body(response),
+            '{"date": "2024-03-03", "price": "12.25"}\n'
+            '{"date": "2024-03-02", "price": "11.50"}\n'
+        )
+
+    def test_csv_from_accept_header(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="S1_prices.csv"')
+        self.assertEqual(
+            self.body(response),
+            'date,price\r\n2024-03-03,12.25\r\n2024-03-02,11.50\r\n2024-03-01,10.00\r\n'
+        )
+
+    def test_errors_are_rendered_as_csv(self):
+        response = self.client.get(reverse('stock-prices', args=['NOPE']), HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(response.content.decode(), 'detail\r\nNo Stock matches the given query.\r\n')
+
+        response = self.client.get(self.url, {'start_date': 'soon'}, HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(response.content.decode(), 'date\r\nInvalid format. Use YYYY-MM-DD.\r\n')
@@ -0,0 +1,41 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from django.urls import reverse
+from api_portfolio.models import Stock, StockPrice
+
+
+class PriceIngestionTests(TestCase):
+    def setUp(self):
+        self.stock = Stock.objects.create(symbol='S1', name='Stock 1')
+
+    def post_csv(self, body):
+        return self.client.post(reverse('stock-prices-bulk'), body, content_type='text/csv')
+
+    def test_invalid_rows_are_reported(self):
+        response = self.post_csv(
+            'symbol,date,price\n'
+            'S1,2024-02-29,10.00\n'
+            'S1,2024-02-30,10.00\n'
+            'S1,2024-13-01,10.00\n'
+            'S1,29/02/2024,10.00\n'
+            'S1,2024-03-01,-1\n'
+            'S2,2024-03-01,10.00\n'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'received': 6,
+            'upserted': 1,
+            'error_count': 5,
+            'errors': [
+                {'line': 3, 'error': 'date must be YYYY-MM-DD'},
+                {'line': 4, 'error': 'date must be YYYY-MM-DD'},
+                {'line': 5, 'error': 'date must be YYYY-MM-DD'},
+                {'line': 6, 'error': 'price must be positive'},
+                {'line': 7, 'error': 'Unknown symbol S2'},
+            ],
+        })
+        self.assertEqual(
+            list(StockPrice.objects.values_list('stock', 'date', 'price')),
+            [(self.stock.pk, date(2024, 2, 29), Decimal('10.00'))]
+        )
@@ -0,0 +1,64 @@
+import shutil
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from django.test import TestCase
+from api_portfolio.models import Stock, StockPrice
+from api_portfolio.services.latest_price_service import LatestPriceService
+from api_portfolio.services.price_store import EPOCH, ColumnarPriceStore
+
+START = date(2024, 1, 1)
+
+
+class ColumnarPriceStoreTests(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        self.store = ColumnarPriceStore(self.path)
+        self.stock = Stock.objects.create(symbol='S1', name='Stock 1')
+        self.add_prices(0, ['10.00', '11.00', '12.00', '13.00'])
+        self.store.export()
+
+    def add_prices(self, first_day, prices):
+        StockPrice.objects.bulk_create([
+            StockPrice(stock=self.stock, date=START + timedelta(days=first_day + day), price=Decimal(price))
+            for day, price in enumerate(prices)
+        ])
+        LatestPriceService.refresh([self.stock.pk])
+
+    def stored(self):
+        days, prices = self.store.series(self.stock.pk)
+        return [
+            (EPOCH + timedelta(days=int(day)), Decimal(int(price)).scaleb(-2))
+            for day, price in zip(days, prices)
+        ]
+
+    def database(self):
+        return list(self.stock.prices.order_by('date').values_list('date', 'price'))
+
+    def test_new_dates_are_appended(self):
+        self.add_prices(4, ['14.00', '15.00'])
+        stats = self.store.export()
+        self.assertEqual((stats['appended'], stats['written'], stats['rows']), (1, 0, 2))
+        self.assertEqual(self.stored(), self.database())
+
+        self.assertEqual(self.store.export()['unchanged'], 1)
+
+    def test_swapped_prices_rewrite_the_stock(self):
+        # Count and sum of the exported rows stay the same.
+        StockPrice.objects.filter(stock=self.stock, date=START).update(price=Decimal('11.00'))
+        StockPrice.objects.filter(stock=self.stock, date=START + timedelta(days=1)).update(price=Decimal('10.00'))
+        self.add_prices(4, ['14.00'])
+        stats = self.store.export()
+        self.assertEqual((stats['appended'], stats['written'], stats['rows']), (0, 1, 5))
+        self.assertEqual(self.stored(), self.database())
+
+    def test_offsetting_corrections_rewrite_the_stock(self):
+        # Count, sum and any date-weighted sum of the rows stay the same.
+        for day, correction in ((0, '0.01'), (1, '-0.02'), (2, '0.01')):
+            price = StockPrice.objects.get(stock=self.stock, date=START + timedelta(days=day))
+            price.price += Decimal(correction)
+            price.save()
+        stats = self.store.export()
+        self.assertEqual((stats['appended'], stats['written'], stats['rows']), (0, 1, 4))
+        self.assertEqual(self.stored(), self.database())
@@ -0,0 +1,46 @@
+import json
+from datetime import date
+from decimal import Decimal
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from api_portfolio.models import Holding, Portfolio, Stock, StockPrice
+from api_portfolio.services.price_cache import get_price_cache
+from api_portfolio.utils.constants import PROFILING_LOGGER
+
+
+@override_settings(REQUEST_PROFILING={'ENABLED': True, 'SAMPLE_RATE': 1.0})
+class RequestProfilingTests(TestCase):
+    def setUp(self):
+        get_price_cache().clear()
+        caches['default'].clear()
+        stock = Stock.objects.create(symbol='S1', name='Stock 1')
+        StockPrice.objects.create(stock=stock, date=date(2024, 3, 1), price=Decimal('10.00'))
+        portfolio = Portfolio.objects.create(name='p')
+        Holding.objects.create(
+            portfolio=portfolio, stock=stock, quantity=Decimal('2.00'), purchase_date=date(2024, 3, 1)
+        )
+        self.url = reverse('portfolio-summary', args=['p'])
+
+    def test_server_timing(self):
+        with self.assertLogs(PROFILING_LOGGER) as logs:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        timing = response['Server-Timing']
+        self.assertRegex(
+            timing,
+            r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="3 queries, 0 duplicates", '
+            r'valuation;dur=[\d.]+, serialize;dur=[\d.]+$'
+        )
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(
+            (record['method'], record['path'], record['status'], record['queries']),
+            ('GET', self.url, 200, 3)
+        )
+        self.assertEqual(record['duplicates'], [])
+        self.assertEqual(set(record['sections_ms']), {'valuation', 'serialize'})
+
+    @override_settings(REQUEST_PROFILING={'ENABLED': False})
+    def test_disabled(self):
+        self.assertNotIn('Server-Timing', self.client.get(self.url))
@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from api_portfolio.models import Holding, Portfolio, Stock, StockPrice
+from api_portfolio.services.price_cache import get_price_cache
+from api_portfolio.signals import notify_prices_written
+from api_portfolio.utils.constants import ADD_STOCKS_BULK_MODE, EXPAND_VALUATION
+
+TODAY = date(2025, 4, 25)
+RANGE = {'start_date': '2025-04-01', 'end_date': '2025-04-20'}
+
+
+class QueryCountTests(TestCase):
+    """Valuation reads cost the same number of queries for any number of holdings."""
+    def setUp(self):
+        get_price_cache().clear()
+        caches['default'].clear()
+
+    def seed(self, name, holdings):
+        portfolio = Portfolio.objects.create(name=name)
+        for index in range(holdings):
+            stock = Stock.objects.create(symbol=f'{name}{index}'.upper(), name=f'Stock {index}')
+            StockPrice.objects.bulk_create([
+                StockPrice(stock=stock, date=TODAY - timedelta(days=day), price=Decimal(100 + index + day) / 4)
+                for day in range(0, 40, 3)
+            ])
+            notify_prices_written({stock.pk: TODAY - timedelta(days=39)})
+            Holding.objects.create(
+                portfolio=portfolio, stock=stock, quantity=Decimal('1.50') + index, purchase_date=TODAY
+            )
+        return portfolio
+
+    @staticmethod
+    def payload(name):
+        # Two held stocks and three new ones.
+        symbols = [f'{name}0', f'{name}1', f'{name}new0', f'{name}new1', f'{name}new2']
+        return {'stocks': [{'symbol': symbol, 'quantity': '2.00'} for symbol in symbols]}
+
+    def assert_constant(self, queries, request):
+        for holdings in (2, 20):
+            portfolio = self.seed(f'p{holdings}', holdings)
+            get_price_cache().clear()
+            caches['default'].clear()
+            with self.assertNumQueries(queries):
+                response = request(portfolio)
+            self.assertEqual(response.status_code, 200)
+
+    def test_summary(self):
+        self.assert_constant(3, lambda portfolio: self.client.get(
+            reverse('portfolio-summary', args=[portfolio.name])
+        ))
+
+    def test_summary_with_range(self):
+        self.assert_constant(3, lambda portfolio: self.client.get(
+            reverse('portfolio-summary', args=[portfolio.name]), RANGE
+        ))
+
+    def test_list_with_valuation(self):
+        self.seed('other', 5)
+        self.assert_constant(3, lambda portfolio: self.client.get(
+            reverse('list-portfolio'), {'expand': EXPAND_VALUATION, **RANGE}
+        ))
+
+    def test_add_stocks_bulk(self):
+        self.assert_constant(12, lambda portfolio: self.client.post(
+            reverse('add-stocks-to-portfolio', args=[portfolio.name]) + f'?mode={ADD_STOCKS_BULK_MODE}',
+            self.payload(portfolio.name),
+            content_type='application/json'
+        ))
+
+    def test_add_stocks(self):
+        # Per-item mode costs a fixed number of queries per item and a
+        # constant number for the response valuation.
+        portfolio = self.seed('items', 3)
+        with self.assertNumQueries(35):
+            response = self.client.post(
+                reverse('add-stocks-to-portfolio', args=[portfolio.name]),
+                self.payload(portfolio.name),
+                content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['created_holdings'], 3)
+        self.assertEqual(response.json()['updated_holdings'], 2)
@@ -0,0 +1,29 @@
+from io import StringIO
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from api_portfolio.management.commands.check_query_plans import Command
+from api_portfolio.models import StockPrice
+
+
+class UnindexedQueries(Command):
+    def hot_queries(self):
+        return {
+            **super().hot_queries(),
+            'prices by value': StockPrice.objects.filter(price=10).order_by(),
+            'prices sorted by value': StockPrice.objects.filter(stock_id=1).order_by('price'),
+        }
+
+
+class QueryPlanTests(TestCase):
+    def test_hot_queries_use_indexes(self):
+        output = StringIO()
+        call_command('check_query_plans', stdout=output)
+        self.assertIn('All hot query plans use indexes', output.getvalue())
+
+    def test_bad_plans_are_reported(self):
+        with self.assertRaises(CommandError) as raised:
+            call_command(UnindexedQueries(), stdout=StringIO())
+        message = str(raised.exception)
+        self.assertIn('prices by value (full scan)', message)
+        self.assertIn('prices sorted by value (temp b-tree sort)', message)
+        self.assertNotIn('current price', message)
@@ -0,0 +1,44 @@
+from datetime import date
+from decimal import Decimal
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from api_portfolio.models import Holding, Portfolio, Stock, StockPrice
+from api_portfolio.services.latest_price_service import LatestPriceService
+from api_portfolio.services.price_cache import get_price_cache
+
+
+class SummaryCacheTests(TestCase):
+    def setUp(self):
+        get_price_cache().clear()
+        caches['default'].clear()
+        self.stock = Stock.objects.create(symbol='S1', name='Stock 1')
+        StockPrice.objects.create(stock=self.stock, date=date(2024, 3, 1), price=Decimal('10.00'))
+        self.portfolio = Portfolio.objects.create(name='p')
+        Holding.objects.create(
+            portfolio=self.portfolio, stock=self.stock, quantity=Decimal('2.00'),
+            purchase_date=date(2024, 3, 1)
+        )
+        self.url = reverse('portfolio-summary', args=['p'])
+
+    def total_value(self):
+        return Decimal(self.client.get(self.url).json()['total_value'])
+
+    def test_hit(self):
+        self.assertEqual(self.total_value(), Decimal('20.00'))
+        with self.assertNumQueries(1):
+            self.assertEqual(self.total_value(), Decimal('20.00'))
+
+    def test_writes_from_other_processes_are_seen(self):
+        self.assertEqual(self.total_value(), Decimal('20.00'))
+        # As another process would write: no signal reaches this one.
+        StockPrice.objects.bulk_create([
+            StockPrice(stock=self.stock, date=date(2024, 3, 2), price=Decimal('12.00'))
+        ])
+        LatestPriceService.refresh([self.stock.pk])
+        self.assertEqual(self.total_value(), Decimal('24.00'))
+
+        holding = self.portfolio.holdings.get()
+        holding.quantity = Decimal('3.00')
+        holding.save()
+        self.assertEqual(self.total_value(), Decimal('36.00'))
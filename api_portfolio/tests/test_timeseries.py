@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.test import TestCase
+from django.urls import reverse
+from api_portfolio.models import Holding, Portfolio, Stock, StockPrice
+from api_portfolio.utils.constants import TIMESERIES_MAX_DAYS, TIMESERIES_MAX_POINTS
+
+
+class TimeseriesTests(TestCase):
+    def setUp(self):
+        portfolio = Portfolio.objects.create(name='tech')
+        self.stock = stock = Stock.objects.create(symbol='S1', name='Stock 1')
+        StockPrice.objects.create(stock=stock, date=date(2024, 3, 1), price=Decimal('10.00'))
+        StockPrice.objects.create(stock=stock, date=date(2024, 3, 10), price=Decimal('12.00'))
+        Holding.objects.create(
+            portfolio=portfolio, stock=stock, quantity=Decimal('2.00'), purchase_date=date(2024, 3, 1)
+        )
+        self.url = reverse('portfolio-timeseries', args=['tech'])
+
+    def test_start_is_clamped_to_the_first_price(self):
+        response = self.client.get(self.url, {'start': '2010-01-01', 'end': '2024-03-10'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['start'], '2024-03-01')
+        self.assertEqual(len(data['points']), 10)
+        self.assertEqual(data['points'][0], {'date': '2024-03-01', 'value': 20.0, 'profit': 0.0})
+        self.assertEqual(data['points'][-1], {'date': '2024-03-10', 'value': 24.0, 'profit': 4.0})
+
+    def test_range_is_bounded(self):
+        response = self.client.get(self.url, {'start': '1000-01-01', 'end': '2024-03-10'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(TIMESERIES_MAX_DAYS), response.json()['end'][0])
+
+    def test_last_representable_date(self):
+        response = self.client.get(self.url, {'end': '9999-12-31'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['points'][-1]['date'], '9999-12-31')
+
+    def test_points_are_bounded(self):
+        # 7000 days at a stride of 14 leave the last day off the stride.
+        start = date(2024, 3, 10) - timedelta(days=6999)
+        StockPrice.objects.create(stock=self.stock, date=start, price=Decimal('5.00'))
+        response = self.client.get(self.url, {'start': start.isoformat(), 'end': '2024-03-10'})
+        points = response.json()['points']
+        self.assertLessEqual(len(points), TIMESERIES_MAX_POINTS)
+        self.assertEqual(points[0]['date'], start.isoformat())
+        self.assertEqual(points[-1]['date'], '2024-03-10')
@@ -16,7 +16,8 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path
-from .views import AddStocksToPortfolioView, CreatePortfolioView, PortfolioListView, PortfolioSummaryView, StockListView, StockCreateView, StockPricesView
+from .async_views import AsyncPortfolioSummaryView, AsyncStockListView, AsyncStockPricesView
+from .views import AddStocksToPortfolioView, CreatePortfolioView, PortfolioBatchSummaryView, PortfolioListView, PortfolioSummaryView, PortfolioTimeseriesView, PriceCacheStatsView, StockListView, StockCreateView, StockPricesBulkView, StockPricesView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -24,7 +25,14 @@ urlpatterns = [
     path('api/stocks/create', StockCreateView.as_view(), name='stock-create'),
     path('api/portfolios/create', CreatePortfolioView.as_view(), name='create-portfolio'),
     path('api/portfolios', PortfolioListView.as_view(), name='list-portfolio'),
+    path('api/stocks/prices/bulk', StockPricesBulkView.as_view(), name='stock-prices-bulk'),
     path('api/stocks/prices/<str:symbol>/', StockPricesView.as_view(), name='stock-prices'),
+    path('api/portfolios/summary/batch', PortfolioBatchSummaryView.as_view(), name='portfolio-summary-batch'),
     path('api/portfolios/<str:name>/add_stocks/', AddStocksToPortfolioView.as_view(), name='add-stocks-to-portfolio'),
     path('api/portfolios/<str:name>/summary/', PortfolioSummaryView.as_view(), name='portfolio-summary'),
+    path('api/portfolios/<str:name>/timeseries/', PortfolioTimeseriesView.as_view(), name='portfolio-timeseries'),
+    path('api/cache/prices/', PriceCacheStatsView.as_view(), name='price-cache-stats'),
+    path('api/async/stocks/', AsyncStockListView.as_view(), name='async-stock-list'),
+    path('api/async/stocks/prices/<str:symbol>/', AsyncStockPricesView.as_view(), name='async-stock-prices'),
+    path('api/async/portfolios/<str:name>/summary/', AsyncPortfolioSummaryView.as_view(), name='async-portfolio-summary'),
 ]
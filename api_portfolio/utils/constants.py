@@ -1,8 +1,47 @@
 MAX_LENGTH_SYMBOL = 10
 MAX_LENGTH_QUANTITY = 10
 MAX_LENGTH_QUANTITY_DECIMAL_PLACES = 2
+MAX_LENGTH_PRICE = 10
+MAX_LENGTH_PRICE_DECIMAL_PLACES = 2
 YEAR_DAYS = 365.25
 ZERO_ANNUALIZED_RETURN = 0.0
 ZERO_INVESTMENT = 0
 ZERO_PROFIT = 0
-ZERO_YEARS = 0
\ No newline at end of file
+ZERO_YEARS = 0
+LATEST_PRICE_REFRESH_BATCH_SIZE = 500
+PRICE_CACHE_DEFAULT_MAX_SIZE = 10000
+PRICE_CACHE_KEY_PREFIX = 'price_entry'
+BULK_BATCH_SIZE = 1000
+ADD_STOCKS_BULK_MODE = 'bulk'
+PRICE_EXPORT_CHUNK_SIZE = 2000
+PRICE_EXPORT_BUFFER_SIZE = 64 * 1024
+PRICE_EXPORT_FORMATS = ('ndjson', 'csv')
+EXPAND_VALUATION = 'valuation'
+ANALYTICS_RELATIVE_TOLERANCE = 1e-9
+TIMESERIES_INTERVALS = ('day', 'week', 'month')
+TIMESERIES_DEFAULT_DAYS = 365
+TIMESERIES_MAX_POINTS = 500
+FAKE_PRICES_CHUNK_SIZE = 50000
+BENCHMARK_PREFIX = 'BENCH'
+PROFILING_LOGGER = 'api_portfolio.profiling'
+PROFILING_DEFAULT_SAMPLE_RATE = 1.0
+PROFILING_DUPLICATE_LIMIT = 5
+PROFILING_SQL_PREVIEW_LENGTH = 200
+PRICE_INGEST_CHUNK_SIZE = 5000
+PRICE_INGEST_MAX_ERRORS = 1000
+PRICE_INGEST_FIELDS = ('symbol', 'date', 'price')
+SUMMARY_CACHE_KEY_PREFIX = 'summary'
+SUMMARY_CACHE_DEFAULT_TIMEOUT = 60 * 60
+PORTFOLIO_BATCH_MAX_SIZE = 5000
+PORTFOLIO_BATCH_CHUNK_SIZE = 200
+PRICE_STORE_FORMAT = 3
+PRICE_STORE_MANIFEST = 'manifest.json'
+PRICE_STORE_DATE_DTYPE = '<i4'
+PRICE_STORE_PRICE_DTYPE = '<i8'
+PRICE_STORE_SAVE_EVERY = 500
+BACKTEST_DEFAULT_DAYS = 5 * 365
+BACKTEST_DEFAULT_WINDOW_DAYS = 30
+BACKTEST_CHUNK_SIZE = 50
+BACKTEST_FIELDS = ('portfolio', 'start_date', 'end_date', 'profit', 'initial_investment', 'annualized_return')
+REPLICA_STICKY_COOKIE = 'read_primary'
+TIMESERIES_MAX_DAYS = 20 * 366
\ No newline at end of file
@@ -0,0 +1,41 @@
+from decimal import Decimal
+from api_portfolio.utils.constants import (
+    MAX_LENGTH_PRICE_DECIMAL_PLACES,
+    MAX_LENGTH_QUANTITY_DECIMAL_PLACES,
+)
+
+# Prices and quantities are stored with a fixed number of decimal places, so
+# they are exact integers once scaled; a price times a quantity is an exact
+# integer of VALUE_PLACES places. Valuation loops add and multiply those
+# integers and only build a Decimal for the result.
+PRICE_PLACES = MAX_LENGTH_PRICE_DECIMAL_PLACES
+QUANTITY_PLACES = MAX_LENGTH_QUANTITY_DECIMAL_PLACES
+VALUE_PLACES = PRICE_PLACES + QUANTITY_PLACES
+
+
+def to_units(value, places):
+    numerator, denominator = value.as_integer_ratio()
+    units, remainder = divmod(numerator * 10 ** places, denominator)
+    if remainder:
+        raise ValueError(f"{value} has more than {places} decimal places")
+    return units
+
+
+def from_units(units, places):
+    return Decimal(units).scaleb(-places)
+
+
+def price_units(price):
+    return to_units(price, PRICE_PLACES)
+
+
+def quantity_units(quantity):
+    return to_units(quantity, QUANTITY_PLACES)
+
+
+def value_units(value):
+    return to_units(value, VALUE_PLACES)
+
+
+def to_value(units):
+    return from_units(units, VALUE_PLACES)
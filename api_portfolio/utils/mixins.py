@@ -1,5 +1,9 @@
+import hashlib
 from django.utils.dateparse import parse_date
+from django.utils.http import http_date, quote_etag
+from django.utils.cache import get_conditional_response
 from rest_framework import serializers
+from api_portfolio.db_router import replica_reads
 
 class DateValidationMixin:
     def validate_dates(self, date_str):
@@ -17,3 +21,51 @@ class DateValidationMixin:
             raise serializers.ValidationError(errors)
 
         return date
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support for DRF views and AsyncAPIView.
+    ``check_not_modified`` answers 304 (or 412) from cheap validators
+    before the response is built; the validators are then sent with the
+    response.
+    """
+    cache_validators = None
+
+    def get_response_format(self):
+        return self.request.accepted_renderer.format
+
+    def get_etag(self, *parts):
+        key = repr((
+            *parts,
+            sorted(self.request.GET.lists()),
+            self.get_response_format(),
+        ))
+        return quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+
+    def check_not_modified(self, etag, last_modified=None):
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        self.cache_validators = (etag, timestamp)
+        return get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.cache_validators and response.status_code in (200, 304):
+            etag, timestamp = self.cache_validators
+            response.headers['ETag'] = etag
+            if timestamp is not None:
+                response.headers['Last-Modified'] = http_date(timestamp)
+        return response
+
+
+class ReplicaReadMixin:
+    """Runs the view's queries on the read replica, when there is one."""
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self._async_dispatch(request, *args, **kwargs)
+        with replica_reads():
+            return super().dispatch(request, *args, **kwargs)
+
+    async def _async_dispatch(self, request, *args, **kwargs):
+        with replica_reads():
+            return await super().dispatch(request, *args, **kwargs)
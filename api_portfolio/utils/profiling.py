@@ -0,0 +1,94 @@
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from api_portfolio.utils.constants import PROFILING_DUPLICATE_LIMIT
+
+_current_profile = ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """
+    SQL and section timings of one request. Queries are grouped by their
+    SQL text (parameters excluded), so the same statement run once per row
+    shows up as a duplicate.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total_time = None
+        self.db_time = 0.0
+        self.statements = Counter()
+        self.sections = defaultdict(float)
+        self._depth = Counter()
+
+    @property
+    def query_count(self):
+        return sum(self.statements.values())
+
+    @property
+    def duplicate_count(self):
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def duplicates(self, limit=PROFILING_DUPLICATE_LIMIT):
+        return [
+            (sql, count) for sql, count in self.statements.most_common(limit) if count > 1
+        ]
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.statements[sql] += 1
+
+    def finish(self):
+        self.total_time = time.perf_counter() - self.started
+
+    def server_timing(self):
+        metrics = [
+            f'total;dur={self.total_time * 1000:.2f}',
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.query_count} queries, '
+            f'{self.duplicate_count} duplicates"',
+        ]
+        metrics.extend(
+            f'{name};dur={duration * 1000:.2f}' for name, duration in self.sections.items()
+        )
+        return ', '.join(metrics)
+
+
+@contextmanager
+def profiling(profile):
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+@contextmanager
+def profile_section(name):
+    """
+    Adds the time spent in the block to section ``name`` of the current
+    request profile. Nested blocks of the same section are counted once.
+    Does nothing when the request is not profiled.
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+
+    profile._depth[name] += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile._depth[name] -= 1
+        if not profile._depth[name]:
+            profile.sections[name] += time.perf_counter() - started
+
+
+class ProfiledSerializerMixin:
+    def to_representation(self, instance):
+        with profile_section('serialize'):
+            return super().to_representation(instance)
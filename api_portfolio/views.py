@@ -1,27 +1,101 @@
+import json
+from django.db.models import Prefetch, prefetch_related_objects
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, status
-from rest_framework.pagination import PageNumberPagination
-from api_portfolio.models import Stock, Portfolio, StockPrice
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from api_portfolio.models import Holding, Stock, Portfolio, StockPrice
+from api_portfolio.pagination import (
+    KeysetOrPageNumberPagination,
+    PriceKeysetOrPageNumberPagination,
+)
 from api_portfolio.serializers import (
     AddStocksToPortfolioSerializer,
     PortfolioCreateSerializer,
+    PortfolioBatchSummaryQuerySerializer,
+    PortfolioListSerializer,
     PortfolioSummarySerializer,
+    PortfolioTimeseriesQuerySerializer,
     SimpleStockSerializer,
     StockPriceSerializer,
 )
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from api_portfolio.services.portfolio_analytics import PortfolioAnalytics
+from api_portfolio.services.portfolio_batch_valuation import PortfolioBatchValuation
 from api_portfolio.services.portfolio_service import PortfolioService 
+from api_portfolio.services.portfolio_valuation import PortfolioValuation
+from api_portfolio.services.price_cache import get_price_cache
+from api_portfolio.services.price_export import PriceExportService
+from api_portfolio.services.price_ingestion import PriceIngestionService, PriceRowError
+from api_portfolio.services.price_resolver import PriceResolver
+from api_portfolio.services.summary_cache import get_summary_cache
+from api_portfolio.utils.constants import (
+    ADD_STOCKS_BULK_MODE,
+    EXPAND_VALUATION,
+    PRICE_EXPORT_FORMATS,
+    TIMESERIES_MAX_POINTS,
+)
+from api_portfolio.utils.mixins import ConditionalGetMixin, DateValidationMixin, ReplicaReadMixin
+from api_portfolio.utils.renderers import CSVRenderer, NDJSONRenderer
 
 
-class PortfolioListView(generics.ListAPIView):
-    queryset = Portfolio.objects.all()
-    serializer_class = PortfolioSummarySerializer
+class PortfolioPricesMixin(DateValidationMixin):
+    def get_holdings_prefetch(self):
+        return Prefetch('holdings', queryset=Holding.objects.select_related('stock'))
+
+    def get_portfolio_queryset(self):
+        return Portfolio.objects.prefetch_related(self.get_holdings_prefetch())
+
+    def get_date_range(self):
+        start_date = self.validate_dates(self.request.query_params.get('start_date'))
+        end_date = self.validate_dates(self.request.query_params.get('end_date'))
+        return start_date, end_date
+
+    def get_price_dates(self):
+        start_date, end_date = self.get_date_range()
+        if not start_date or not end_date:
+            return []
+        return [start_date, end_date]
+
+
+class PortfolioListView(ReplicaReadMixin, PortfolioPricesMixin, generics.ListAPIView):
+    pagination_class = KeysetOrPageNumberPagination
+    page = None
+
+    def expand_valuation(self):
+        expand = self.request.query_params.get('expand', '')
+        return EXPAND_VALUATION in expand.split(',')
+
+    def get_serializer_class(self):
+        if self.expand_valuation():
+            return PortfolioSummarySerializer
+        return PortfolioListSerializer
+
+    def get_queryset(self):
+        if self.expand_valuation():
+            return self.get_portfolio_queryset().order_by('id')
+        return PortfolioService.with_list_fields(Portfolio.objects.all()).order_by('id')
+
+    def paginate_queryset(self, queryset):
+        self.page = super().paginate_queryset(queryset)
+        return self.page
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.expand_valuation() and self.page is not None:
+            context['prices'] = PriceResolver.for_holdings(
+                [holding for portfolio in self.page for holding in portfolio.holdings.all()],
+                self.get_price_dates()
+            )
+        return context
 
 
 class StockListView(generics.ListAPIView):
-    queryset = Stock.objects.all()
+    queryset = Stock.objects.order_by('id')
     serializer_class = SimpleStockSerializer
+    pagination_class = KeysetOrPageNumberPagination
 
 
 class StockCreateView(generics.CreateAPIView):
@@ -56,9 +130,11 @@ class AddStocksToPortfolioView(generics.GenericAPIView):
         serializer.is_valid(raise_exception=True)
 
         portfolio_service = PortfolioService(portfolio)
-        created_count, updated_count = portfolio_service.add_stocks_to_portfolio(
-            serializer.validated_data['stocks']
-        )
+        if request.query_params.get('mode') == ADD_STOCKS_BULK_MODE:
+            add_stocks = portfolio_service.bulk_add_stocks_to_portfolio
+        else:
+            add_stocks = portfolio_service.add_stocks_to_portfolio
+        created_count, updated_count = add_stocks(serializer.validated_data['stocks'])
 
         response_data = {
             'portfolio': portfolio.name,
@@ -71,14 +147,9 @@ class AddStocksToPortfolioView(generics.GenericAPIView):
         return Response(response_data, status=status.HTTP_200_OK)
 
 
-class StandardResultsSetPagination(PageNumberPagination):
-    page_size = 20
-    page_size_query_param = 'page_size'
-    max_page_size = 100
-
-
-class StockPricesView(APIView):
-    pagination_class = StandardResultsSetPagination
+class StockPricesView(ReplicaReadMixin, ConditionalGetMixin, DateValidationMixin, APIView):
+    pagination_class = PriceKeysetOrPageNumberPagination
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer, CSVRenderer]
     
     @property
     def paginator(self):
@@ -89,10 +160,43 @@ class StockPricesView(APIView):
     def paginate_queryset(self, queryset):
         return self.paginator.paginate_queryset(queryset, self.request, view=self)
     
+    def stream_prices(self, prices, symbol):
+        renderer = self.request.accepted_renderer
+        # The rows are read after the view returns, so bind the queryset to
+        # the database the view reads from now.
+        export = PriceExportService(prices.using(prices.db))
+        response = StreamingHttpResponse(
+            getattr(export, renderer.format)(),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}'
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{symbol}_prices.{renderer.format}"'
+        )
+        return response
+
     def get(self, request, symbol, format=None):
-        stock = get_object_or_404(Stock, symbol=symbol.upper())
+        stock = get_object_or_404(
+            Stock.objects.select_related('latest_price'), symbol=symbol.upper()
+        )
+        latest = getattr(stock, 'latest_price', None)
+        not_modified = self.check_not_modified(
+            self.get_etag(stock.pk, latest and latest.date, latest and latest.updated_at),
+            latest and latest.updated_at
+        )
+        if not_modified:
+            return not_modified
+
+        start_date = self.validate_dates(request.query_params.get('start_date'))
+        end_date = self.validate_dates(request.query_params.get('end_date'))
         
         prices = StockPrice.objects.filter(stock=stock).order_by('-date')
+        if start_date:
+            prices = prices.filter(date__gte=start_date)
+        if end_date:
+            prices = prices.filter(date__lte=end_date)
+
+        if request.accepted_renderer.format in PRICE_EXPORT_FORMATS:
+            return self.stream_prices(prices, stock.symbol)
         
         page = self.paginate_queryset(prices)
         
@@ -104,13 +208,133 @@ class StockPricesView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class PortfolioSummaryView(generics.RetrieveAPIView):
+class StockPricesBulkView(APIView):
+    readers = {
+        CSVRenderer.media_type: PriceIngestionService.read_csv,
+        NDJSONRenderer.media_type: PriceIngestionService.read_ndjson,
+    }
+
+    def post(self, request, format=None):
+        reader = self.readers.get(request.content_type.split(';')[0].strip())
+        if reader is None:
+            return Response(
+                {'detail': f"Send prices as {' or '.join(self.readers)}."},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+
+        # Read the body line by line instead of through request.data, so
+        # large uploads never sit in memory at once.
+        stream = request.stream or []
+        lines = (line.decode('utf-8', errors='replace') for line in stream)
+        try:
+            report = PriceIngestionService().ingest(reader(lines))
+        except PriceRowError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(report, status=status.HTTP_200_OK)
+
+
+class PortfolioSummaryView(ReplicaReadMixin, ConditionalGetMixin, PortfolioPricesMixin, generics.RetrieveAPIView):
     serializer_class = PortfolioSummarySerializer
     lookup_field = 'name'
     lookup_url_kwarg = 'name'
 
     def get(self, request, name, *args, **kwargs):
-        portfolio = get_object_or_404(Portfolio, name=name)
-        serializer = self.get_serializer(portfolio, context={'request': request})
+        start_date, end_date = self.get_date_range()
+        # Holdings are prefetched only once the validators say the
+        # response has to be built.
+        queryset = self.get_portfolio_queryset().prefetch_related(None)
+        portfolio = get_object_or_404(PortfolioService.with_validators(queryset), name=name)
+        not_modified = self.check_not_modified(
+            self.get_etag(portfolio.pk, portfolio.updated_at, portfolio.prices_updated_at),
+            max(filter(None, [portfolio.updated_at, portfolio.prices_updated_at]))
+        )
+        if not_modified:
+            return not_modified
+
+        summary_cache = get_summary_cache()
+        data = summary_cache.get(portfolio, start_date, end_date)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
+
+        prefetch_related_objects([portfolio], self.get_holdings_prefetch())
+        valuation = PortfolioValuation(portfolio, start_date, end_date)
+        serializer = self.get_serializer(
+            portfolio,
+            context={'request': request, 'valuations': {portfolio.pk: valuation}}
+        )
+        summary_cache.set(portfolio, start_date, end_date, serializer.data)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class PortfolioBatchSummaryView(PortfolioPricesMixin, APIView):
+    def post(self, request, format=None):
+        query = PortfolioBatchSummaryQuerySerializer(data=request.data)
+        query.is_valid(raise_exception=True)
+        start_date = query.validated_data.get('start_date')
+        end_date = query.validated_data.get('end_date')
+
+        batch = PortfolioBatchValuation(
+            self.get_portfolio_queryset(),
+            query.validated_data['portfolios'],
+            start_date,
+            end_date
+        )
+        return StreamingHttpResponse(
+            self.stream(batch),
+            content_type=f'{NDJSONRenderer.media_type}; charset={NDJSONRenderer.charset}'
+        )
+
+    def stream(self, batch):
+        # One NDJSON line per requested name, in request order; one chunk
+        # of portfolios is written at a time.
+        for chunk in batch.chunks():
+            lines = []
+            for name, valuation in chunk:
+                if valuation is None:
+                    data = {'name': name, 'detail': "No Portfolio matches the given query."}
+                else:
+                    portfolio = valuation.portfolio
+                    data = PortfolioSummarySerializer(
+                        portfolio,
+                        context={'request': self.request, 'valuations': {portfolio.pk: valuation}}
+                    ).data
+                lines.append(json.dumps(data, cls=JSONEncoder) + '\n')
+            yield ''.join(lines)
+
+
+class PortfolioTimeseriesView(ReplicaReadMixin, APIView):
+    def get(self, request, name, format=None):
+        query = PortfolioTimeseriesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        start, end, interval = (
+            query.validated_data[field] for field in ('start', 'end', 'interval')
+        )
+
+        portfolio = get_object_or_404(
+            Portfolio.objects.prefetch_related('holdings'), name=name
+        )
+        # Days before the first price have no value; skipping them keeps
+        # the price matrix to the priced part of the range.
+        first_date = PortfolioAnalytics.first_price_date(
+            [holding.stock_id for holding in portfolio.holdings.all()]
+        )
+        if first_date is not None and start < first_date <= end:
+            start = first_date
+        analytics = PortfolioAnalytics(portfolio, start, end)
+
+        response_data = {
+            'portfolio': portfolio.name,
+            'start': start,
+            'end': end,
+            'interval': interval,
+            'points': analytics.timeseries(interval, TIMESERIES_MAX_POINTS),
+        }
+
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class PriceCacheStatsView(APIView):
+    def get(self, request, format=None):
+        return Response(get_price_cache().stats(), status=status.HTTP_200_OK)